@@ -0,0 +1,61 @@
+import copy
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from api_yamdb import metrics
+
+from .cache import bump_version, version_key
+
+# user id -> (expiry on the monotonic clock, shared version, user)
+_users = {}
+
+
+def user_label(user_id):
+    return f'users.user:{user_id}'
+
+
+def forget_user(user_id):
+    """Drop a user from the cache of every process, e.g. after its role or
+    status changed."""
+    _users.pop(user_id, None)
+    bump_version(user_label(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that keeps resolved users for a short time.
+
+    Users are cached per process for ``JWT_USER_CACHE_TTL`` seconds, so
+    most authenticated requests skip the users table. Each entry keeps
+    the version of the user in the shared cache, which saving or
+    deleting the user bumps: a hit costs one cache read, and a changed
+    user is reloaded in every process.
+    """
+
+    def get_user(self, validated_token):
+        ttl = settings.JWT_USER_CACHE_TTL
+        if not ttl:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Token contained no recognizable user identification')
+        now = time.monotonic()
+        version = cache.get(version_key(user_label(user_id)))
+        cached = _users.get(user_id)
+        if cached is None or cached[0] <= now or cached[1] != version:
+            metrics.increment(
+                'yamdb_cache_requests_total', cache='jwt_user', result='miss')
+            user = super().get_user(validated_token)
+            if len(_users) >= settings.JWT_USER_CACHE_SIZE:
+                _users.clear()
+            cached = _users[user_id] = (now + ttl, version, user)
+        else:
+            metrics.increment(
+                'yamdb_cache_requests_total', cache='jwt_user', result='hit')
+        return copy.copy(cached[2])
@@ -0,0 +1,357 @@
+import asyncio
+import itertools
+import math
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.wsgi import WsgiToAsgi
+from django.contrib.auth.tokens import default_token_generator
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.models import User
+
+from api_yamdb.asgi_handlers import AsyncReadApplication
+
+Scenario = namedtuple(
+    'Scenario', 'name method path data client',
+    defaults=(None, 'anonymous'))
+
+# SQLite allows at most 500 rows in a multi-row INSERT.
+BATCH_SIZE = 500
+CATEGORIES = 5
+GENRES = 10
+GENRES_PER_TITLE = 2
+
+
+def seed(titles, reviews, comments, random_seed=0):
+    """Fill the database with a synthetic catalogue.
+
+    Every title gets ``reviews`` reviews by different users and every
+    review ``comments`` comments. Returns the admin user.
+    """
+    rng = random.Random(random_seed)
+    Category.objects.bulk_create(
+        Category(name=f'Категория {index}', slug=f'category-{index}')
+        for index in range(CATEGORIES))
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(GENRES))
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+    Title.objects.bulk_create((
+        Title(
+            name=f'произведение {index:06}',
+            year=rng.randint(1950, 2020),
+            description=f'описание произведения {index}',
+            category_id=rng.choice(category_ids))
+        for index in range(titles)
+    ), batch_size=BATCH_SIZE)
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    GenreTitle.objects.bulk_create((
+        GenreTitle(title_id=title_id, genre_id=genre_id)
+        for title_id in title_ids
+        for genre_id in rng.sample(genre_ids, GENRES_PER_TITLE)
+    ), batch_size=BATCH_SIZE)
+
+    users = [
+        User(username=f'reader{index}', email=f'reader{index}@yamdb.fake')
+        for index in range(max(reviews, comments, 1))
+    ]
+    for user in users:
+        user.set_unusable_password()
+    User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+    user_ids = list(User.objects.values_list('id', flat=True))
+
+    Review.objects.bulk_create((
+        Review(
+            title_id=title_id, author_id=user_ids[index],
+            text=f'отзыв {index}', score=rng.randint(1, 10))
+        for title_id in title_ids
+        for index in range(reviews)
+    ), batch_size=BATCH_SIZE)
+    review_ids = list(Review.objects.values_list('id', flat=True))
+    Comment.objects.bulk_create((
+        Comment(
+            review_id=review_id, author_id=user_ids[index],
+            text=f'комментарий {index}')
+        for review_id in review_ids
+        for index in range(comments)
+    ), batch_size=BATCH_SIZE)
+    Title.objects.rebuild_ratings()
+    Title.objects.update_search_vector()
+    return User.objects.create_superuser(
+        email='admin@yamdb.fake', username='benchmark-admin',
+        password='benchmark', role=User.ADMIN, bio='')
+
+
+def get_scenarios():
+    """Return the benchmarked requests for a seeded database."""
+    title = Title.objects.order_by('id').first()
+    review = Review.objects.filter(title=title).order_by('id').first()
+    genre = title.genre.first()
+    reader = User.objects.filter(is_superuser=False).order_by('id').first()
+    signups = itertools.count()
+
+    def signup_data():
+        number = next(signups)
+        return {
+            'username': f'signup{number}',
+            'email': f'signup{number}@yamdb.fake',
+        }
+
+    return [
+        Scenario('categories-list', 'get', '/api/v1/categories/'),
+        Scenario('titles-list', 'get', '/api/v1/titles/'),
+        Scenario(
+            'titles-list-compact', 'get',
+            '/api/v1/titles/?fields=id,name,year,rating'),
+        Scenario(
+            'titles-list-filtered', 'get',
+            f'/api/v1/titles/?genre={genre.slug}&year={title.year}'),
+        Scenario(
+            'titles-search', 'get', '/api/v1/titles/?search=произведение'),
+        Scenario('titles-detail', 'get', f'/api/v1/titles/{title.id}/'),
+        Scenario(
+            'reviews-list', 'get', f'/api/v1/titles/{title.id}/reviews/'),
+        Scenario(
+            'comments-list', 'get',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'),
+        Scenario('signup', 'post', '/api/v1/auth/signup/', signup_data),
+        Scenario(
+            'token', 'post', '/api/v1/auth/token/',
+            {
+                'username': reader.username,
+                'confirmation_code':
+                    default_token_generator.make_token(reader),
+            }),
+        Scenario(
+            'admin-titles', 'get', '/admin/reviews/title/', client='admin'),
+        Scenario(
+            'admin-reviews', 'get', '/admin/reviews/review/',
+            client='admin'),
+        Scenario(
+            'admin-comments', 'get', '/admin/reviews/comment/',
+            client='admin'),
+        Scenario('admin-users', 'get', '/admin/users/user/', client='admin'),
+    ]
+
+
+def screen_lists():
+    """Return the lists a phone screen shows and the rows that fill one."""
+    title = Title.objects.order_by('id').first()
+    review = Review.objects.filter(title=title).order_by('id').first()
+    return [
+        ('titles', '/api/v1/titles/', 20),
+        ('reviews', f'/api/v1/titles/{title.id}/reviews/', 20),
+        ('comments',
+         f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/', 50),
+    ]
+
+
+def get_clients(admin):
+    admin_client = Client()
+    admin_client.force_login(admin)
+    return {'anonymous': Client(), 'admin': admin_client}
+
+
+def send(clients, scenario):
+    client = clients[scenario.client]
+    if scenario.method == 'get':
+        return client.get(scenario.path)
+    data = scenario.data() if callable(scenario.data) else scenario.data
+    return getattr(client, scenario.method)(
+        scenario.path, data, content_type='application/json')
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of sorted values."""
+    index = max(math.ceil(len(values) * percent / 100) - 1, 0)
+    return values[index]
+
+
+def summarize(timings, errors, elapsed):
+    timings.sort()
+    return {
+        'requests': len(timings),
+        'errors': errors,
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p90_ms': round(percentile(timings, 90), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'max_ms': round(timings[-1], 3),
+        'throughput_rps': round(len(timings) / elapsed, 1),
+    }
+
+
+def measure(clients, scenario, requests, warmup):
+    """Time ``requests`` sequential requests after ``warmup`` ones.
+
+    The queries are counted on one extra request, so that capturing them
+    does not weigh on the timings.
+    """
+    for _ in range(warmup):
+        send(clients, scenario)
+    with CaptureQueriesContext(connection) as queries:
+        send(clients, scenario)
+    # Every request clears connection.queries, so count them right away.
+    query_count = len(queries)
+    timings = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = send(clients, scenario)
+        timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            errors += 1
+    elapsed = time.perf_counter() - started
+    return {
+        **summarize(timings, errors, elapsed),
+        'queries': query_count,
+    }
+
+
+def load_screen(client, path, rows):
+    """Fetch ``rows`` items of a list page by page as a client filling a
+    screen does, return the number of requests it took."""
+    requests = 0
+    fetched = 0
+    while path and fetched < rows:
+        data = client.get(path).json()
+        requests += 1
+        fetched += len(data['results'])
+        path = data['next']
+    return requests
+
+
+def measure_screen(client, path, rows, screens, warmup):
+    """Time filling ``screens`` screens of ``rows`` items from a list."""
+    for _ in range(warmup):
+        load_screen(client, path, rows)
+    timings = []
+    started = time.perf_counter()
+    for _ in range(screens):
+        start = time.perf_counter()
+        requests = load_screen(client, path, rows)
+        timings.append((time.perf_counter() - start) * 1000)
+    elapsed = time.perf_counter() - started
+    return {
+        **summarize(timings, 0, elapsed),
+        'requests_per_screen': requests,
+    }
+
+
+def screen_variants(path, rows):
+    """The default page size, pages of a screen, and those uncounted."""
+    separator = '&' if '?' in path else '?'
+    return {
+        'default': path,
+        str(rows): f'{path}{separator}page_size={rows}',
+        f'{rows}-uncounted': f'{path}{separator}page_size={rows}&count=false',
+    }
+
+
+def asgi_scenarios():
+    """Return the list requests that the ASGI mode serves asynchronously."""
+    return [
+        scenario for scenario in get_scenarios()
+        if scenario.name in ('titles-list', 'reviews-list', 'comments-list')
+    ]
+
+
+async def drive(application, path, requests, concurrency, client_delay):
+    """Send requests through an ASGI application from concurrent clients.
+
+    Every client takes ``client_delay`` seconds to read a response body,
+    like a mobile client on a slow network.
+    """
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'http_version': '1.1', 'method': 'GET',
+        'path': path, 'query_string': query.encode(),
+        'headers': [(b'host', b'testserver')],
+    }
+    clients = asyncio.Semaphore(concurrency)
+    timings = []
+    statuses = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def client():
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuses.append(message['status'])
+            else:
+                await asyncio.sleep(client_delay)
+
+        async with clients:
+            start = time.perf_counter()
+            await application(dict(scope), receive, send)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    errors = sum(status >= 400 for status in statuses)
+    return summarize(timings, errors, elapsed)
+
+
+def measure_asgi(scenario, requests, concurrency, client_delay, threads):
+    """Compare the sync and async serving of a list under slow clients.
+
+    ``sync`` is the WSGI application behind ``WsgiToAsgi``, where a thread
+    is busy until the client has read the response, as with gunicorn's
+    sync workers. ``async`` is ``AsyncReadApplication``. Both get
+    ``threads`` threads.
+    """
+    wsgi_application = get_wsgi_application()
+    executor = ThreadPoolExecutor(max_workers=threads)
+    results = {}
+
+    async def run_sync():
+        asyncio.get_event_loop().set_default_executor(executor)
+        return await drive(
+            WsgiToAsgi(wsgi_application), scenario.path, requests,
+            concurrency, client_delay)
+
+    try:
+        results['sync'] = asyncio.run(run_sync())
+    finally:
+        executor.shutdown(wait=True)
+    application = AsyncReadApplication(wsgi_application, threads)
+    try:
+        results['async'] = asyncio.run(drive(
+            application, scenario.path, requests, concurrency,
+            client_delay))
+    finally:
+        application.executor.shutdown(wait=True)
+    return results
+
+
+def compare(results, baseline, max_regression):
+    """Return the regressions of ``results`` against ``baseline``.
+
+    A scenario regresses when its median latency grows by more than
+    ``max_regression`` percent or it makes more queries.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before or not before['p50_ms']:
+            continue
+        if result.get('queries', 0) > before.get('queries', 0):
+            regressions.append(
+                f'{name}: {before["queries"]} -> {result["queries"]} '
+                'queries')
+        change = (result['p50_ms'] / before['p50_ms'] - 1) * 100
+        if change > max_regression:
+            regressions.append(
+                f'{name}: p50 {before["p50_ms"]} -> {result["p50_ms"]} ms '
+                f'(+{change:.0f}%)')
+    return regressions
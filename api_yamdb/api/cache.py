@@ -0,0 +1,62 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+# Backends whose entries only the process that wrote them sees.
+PER_PROCESS_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+
+VERSION_KEY = 'api:version:{}'
+RESPONSE_KEY = 'api:response:{}'
+
+
+def version_key(label):
+    return VERSION_KEY.format(label)
+
+
+def get_versions(labels):
+    """Return the current version of every model label, seeding new ones.
+
+    A version is the time of the last change in nanoseconds, so it never
+    repeats after eviction or a restart and doubles as a modification
+    date for the ``Last-Modified`` header.
+    """
+    keys = [version_key(label) for label in labels]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(label):
+    """Invalidate every cached response that depends on the model."""
+    cache.set(version_key(label), time.time_ns(), timeout=None)
+
+
+def versions_digest(versions, *parts):
+    value = ':'.join(str(part) for part in (*versions, *parts))
+    return hashlib.md5(value.encode()).hexdigest()
+
+
+def response_key(versions, path):
+    return RESPONSE_KEY.format(versions_digest(versions, path))
+
+
+def check_shared_cache(processes):
+    """Refuse to serve from several processes with a per-process cache.
+
+    The version counters live in the cache: a write bumps them only in
+    the process that handled it, and the other processes would answer
+    with stale 304s and cached responses for good.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if processes > 1 and backend in PER_PROCESS_CACHES:
+        raise ImproperlyConfigured(
+            f'{processes} processes cannot share the {backend} cache: '
+            'set CACHE_BACKEND to a shared backend such as '
+            'django.core.cache.backends.filebased.FileBasedCache, or run '
+            'a single process.')
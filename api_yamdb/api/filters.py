@@ -1,12 +1,17 @@
 import django_filters
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class TitleFilter(django_filters.FilterSet):
     name = django_filters.CharFilter(lookup_expr='icontains')
     genre = django_filters.CharFilter(field_name='genre__slug')
     category = django_filters.CharFilter(field_name='category__slug')
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'category', 'genre')
+        fields = ('name', 'year', 'category', 'genre', 'search')
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
@@ -0,0 +1,187 @@
+import json
+import subprocess
+
+from api.benchmarks import (asgi_scenarios, compare, get_clients,
+                            get_scenarios, measure, measure_asgi,
+                            measure_screen, screen_lists, screen_variants,
+                            seed)
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (override_settings, setup_databases,
+                               teardown_databases)
+from django.utils import timezone
+
+# Responses of the benchmark database must not reach the shared cache.
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmark',
+    }
+}
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', 'HEAD'), stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, check=True, universal_newlines=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic catalogue into a test database and measure the '
+        'latency, throughput and query count of the API hot paths.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--titles', type=int, default=1000, help='Titles to seed.')
+        parser.add_argument(
+            '--reviews', type=int, default=10,
+            help='Reviews to seed per title.')
+        parser.add_argument(
+            '--comments', type=int, default=3,
+            help='Comments to seed per review.')
+        parser.add_argument(
+            '--requests', type=int, default=100,
+            help='Timed requests per scenario.')
+        parser.add_argument(
+            '--warmup', type=int, default=10,
+            help='Untimed requests sent before the timed ones.')
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            help='Run only the named scenario, may be repeated.')
+        parser.add_argument(
+            '--no-cache', action='store_true',
+            help='Turn the API response cache off.')
+        parser.add_argument(
+            '--screens', action='store_true',
+            help='Also time filling a phone screen from the lists with '
+                 'the default and larger page sizes.')
+        parser.add_argument(
+            '--asgi', action='store_true',
+            help='Also compare the sync and ASGI serving of the lists.')
+        parser.add_argument(
+            '--concurrency', type=int, default=50,
+            help='Concurrent clients of the ASGI comparison.')
+        parser.add_argument(
+            '--client-delay', type=float, default=50,
+            help='Milliseconds a client takes to read a response body.')
+        parser.add_argument(
+            '--threads', type=int, default=8,
+            help='Threads serving requests in the ASGI comparison.')
+        parser.add_argument(
+            '--output', default='benchmark.json',
+            help='JSON file the results are written to.')
+        parser.add_argument(
+            '--baseline', help='JSON results of an earlier run to compare.')
+        parser.add_argument(
+            '--max-regression', type=float, default=20,
+            help='Allowed growth of the median latency, in percent.')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests must be positive.')
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with override_settings(
+                    CACHES=BENCHMARK_CACHES,
+                    API_CACHE_ENABLED=not options['no_cache']):
+                results = self.run(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+        report = {
+            'commit': current_commit(),
+            'created': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'dataset': {
+                'titles': options['titles'],
+                'reviews': options['reviews'],
+                'comments': options['comments'],
+            },
+            'cache': not options['no_cache'],
+            'results': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        self.stdout.write(f'Results written to {options["output"]}.')
+        if options['baseline']:
+            self.check_baseline(
+                results, options['baseline'], options['max_regression'])
+
+    def run(self, options):
+        admin = seed(
+            options['titles'], options['reviews'], options['comments'])
+        clients = get_clients(admin)
+        scenarios = get_scenarios()
+        if options['scenarios']:
+            unknown = set(options['scenarios']) - {
+                scenario.name for scenario in scenarios}
+            if unknown:
+                raise CommandError(
+                    f'Unknown scenarios: {", ".join(sorted(unknown))}')
+            scenarios = [
+                scenario for scenario in scenarios
+                if scenario.name in options['scenarios']
+            ]
+        results = {}
+        for scenario in scenarios:
+            result = measure(
+                clients, scenario, options['requests'], options['warmup'])
+            results[scenario.name] = result
+            self.stdout.write(
+                f'{scenario.name:<22} p50 {result["p50_ms"]:>8} ms  '
+                f'p99 {result["p99_ms"]:>8} ms  '
+                f'{result["throughput_rps"]:>7} rps  '
+                f'{result["queries"]:>3} queries  '
+                f'{result["errors"]} errors')
+        if options['screens']:
+            results.update(self.run_screens(clients['anonymous'], options))
+        if options['asgi']:
+            results.update(self.run_asgi(options))
+        return results
+
+    def run_screens(self, client, options):
+        results = {}
+        for name, path, rows in screen_lists():
+            for variant, url in screen_variants(path, rows).items():
+                result = measure_screen(
+                    client, url, rows, options['requests'],
+                    options['warmup'])
+                results[f'screen-{name}-{variant}'] = result
+                self.stdout.write(
+                    f'{"screen-" + name + "-" + variant:<28} '
+                    f'p50 {result["p50_ms"]:>8} ms  '
+                    f'p99 {result["p99_ms"]:>8} ms  '
+                    f'{result["requests_per_screen"]:>3} requests')
+        return results
+
+    def run_asgi(self, options):
+        results = {}
+        for scenario in asgi_scenarios():
+            modes = measure_asgi(
+                scenario, options['requests'], options['concurrency'],
+                options['client_delay'] / 1000, options['threads'])
+            for mode, result in modes.items():
+                name = f'asgi-{mode}-{scenario.name}'
+                results[name] = result
+                self.stdout.write(
+                    f'{name:<26} p50 {result["p50_ms"]:>8} ms  '
+                    f'p99 {result["p99_ms"]:>8} ms  '
+                    f'{result["throughput_rps"]:>7} rps  '
+                    f'{result["errors"]} errors')
+        return results
+
+    def check_baseline(self, results, path, max_regression):
+        with open(path, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline['results'], max_regression)
+        if regressions:
+            raise CommandError(
+                'Regressions against the baseline:\n'
+                + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS(
+            'No regressions against the baseline.'))
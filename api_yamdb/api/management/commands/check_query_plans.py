@@ -0,0 +1,102 @@
+import re
+
+from api.filters import TitleFilter
+from api.views import (CategoriesViewSet, CommentViewSet, GenresViewSet,
+                       ReviewViewSet, TitlesViewSet, UserViewSet)
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from reviews.models import Genre, Review, Title
+
+POSTGRESQL_SEQ_SCAN = re.compile(r'Seq Scan on (\w+)')
+SQLITE_SCAN = re.compile(r'\bSCAN (?:TABLE )?(\w+)(.*)')
+
+
+def viewset_queryset(viewset, **kwargs):
+    """Return the list queryset a viewset builds for the URL kwargs."""
+    view = viewset(action='list', kwargs=kwargs)
+    view.request = Request(RequestFactory().get('/'))
+    return view.get_queryset()
+
+
+def scanned_tables(plan):
+    """Return the tables a query plan reads with a sequential scan."""
+    if connection.vendor == 'postgresql':
+        return set(POSTGRESQL_SEQ_SCAN.findall(plan))
+    return {
+        table for table, rest in SQLITE_SCAN.findall(plan)
+        if 'USING' not in rest
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN on the querysets of the API viewsets and fail if a '
+        'large table is read with a sequential scan.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-rows', type=int, default=10000,
+            help='Tables with fewer rows may be scanned sequentially.')
+
+    def handle(self, *args, **options):
+        failures = []
+        for name, queryset in self.get_querysets():
+            plan = queryset[:api_settings.PAGE_SIZE].explain()
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{name}:\n{plan}\n')
+            for table in scanned_tables(plan):
+                if self.count_rows(table) >= options['min_rows']:
+                    failures.append(f'{name}: sequential scan on {table}')
+        if failures:
+            raise CommandError('\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('No sequential scans found.'))
+
+    def get_querysets(self):
+        title = Title.objects.values(
+            'pk', 'year', 'category__slug').order_by('pk').first() or {}
+        genre = Genre.objects.values_list('slug', flat=True).first()
+        review = Review.objects.values(
+            'pk', 'title_id').order_by('pk').first() or {}
+        titles = viewset_queryset(TitlesViewSet)
+        querysets = [
+            ('UserViewSet.list', viewset_queryset(UserViewSet)),
+            ('CategoriesViewSet.list', viewset_queryset(CategoriesViewSet)),
+            ('GenresViewSet.list', viewset_queryset(GenresViewSet)),
+            ('TitlesViewSet.list', titles),
+            ('TitlesViewSet.list?year',
+             TitleFilter({'year': title.get('year')}, titles).qs),
+            ('TitlesViewSet.list?category',
+             TitleFilter({'category': title.get('category__slug')},
+                         titles).qs),
+            ('TitlesViewSet.list?genre',
+             TitleFilter({'genre': genre}, titles).qs),
+        ]
+        if title:
+            querysets.append((
+                'ReviewViewSet.list',
+                viewset_queryset(ReviewViewSet, title_id=title['pk'])))
+        if review:
+            querysets.append((
+                'CommentViewSet.list',
+                viewset_queryset(CommentViewSet, title_id=review['title_id'],
+                                 review_id=review['pk'])))
+        return querysets
+
+    @staticmethod
+    def count_rows(table):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE relname = %s',
+                    [table])
+                row = cursor.fetchone()
+            return row[0] if row else 0
+        for model in apps.get_models(include_auto_created=True):
+            if model._meta.db_table == table:
+                return model._default_manager.count()
+        return 0
@@ -0,0 +1,162 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.client import HTTPConnection, HTTPException
+
+from api.benchmarks import summarize
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# The CMD of the Dockerfile before gunicorn.conf.py: one sync worker.
+# An empty config file keeps gunicorn from reading gunicorn.conf.py.
+PROFILES = {
+    'baseline': ('-c', os.devnull, '--worker-class', 'sync', '--workers', '1'),
+    'tuned': ('-c', 'gunicorn.conf.py'),
+}
+# gunicorn 20.0 cannot be run with python -m.
+GUNICORN = 'from gunicorn.app.wsgiapp import run; run()'
+DEFAULT_PATHS = (
+    '/api/v1/categories/',
+    '/api/v1/titles/',
+    '/api/v1/titles/?year=2000',
+)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f'gunicorn did not listen on {port} in {timeout}s.')
+
+
+def fetch(connection, path):
+    """GET the path, return the status (None on a connection error) and
+    whether the connection stays open."""
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        response.read()
+    except (OSError, HTTPException):
+        connection.close()
+        return None, False
+    if response.will_close:
+        connection.close()
+    return response.status, not response.will_close
+
+
+def run_clients(port, paths, concurrency, duration):
+    """Request the paths in turn from concurrent keep-alive clients."""
+    timings = []
+    errors = []
+    deadline = time.monotonic() + duration
+
+    def client(offset):
+        connection = HTTPConnection('127.0.0.1', port, timeout=30)
+        reused = False
+        index = offset
+        while time.monotonic() < deadline:
+            path = paths[index % len(paths)]
+            start = time.perf_counter()
+            status, reusable = fetch(connection, path)
+            # The server may close an idle keep-alive connection: retry.
+            if status is None and reused:
+                reused = False
+                continue
+            index += 1
+            reused = reusable
+            if status is None or status >= 400:
+                errors.append(path)
+            if status is not None:
+                timings.append((time.perf_counter() - start) * 1000)
+        connection.close()
+
+    threads = [
+        threading.Thread(target=client, args=(offset,))
+        for offset in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if not timings:
+        raise CommandError('No request succeeded.')
+    return summarize(timings, len(errors), time.perf_counter() - started)
+
+
+class Command(BaseCommand):
+    help = (
+        'Start gunicorn with the old single sync worker and with '
+        'gunicorn.conf.py, load both with concurrent clients and compare '
+        'their throughput. Uses the configured database, so seed it first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help='Path to request, may be repeated.')
+        parser.add_argument(
+            '--concurrency', type=int, default=32,
+            help='Concurrent clients.')
+        parser.add_argument(
+            '--duration', type=float, default=20,
+            help='Seconds each profile is loaded.')
+        parser.add_argument(
+            '--profile', action='append', dest='profiles',
+            choices=PROFILES, help='Profile to run, both by default.')
+        parser.add_argument(
+            '--output', help='JSON file the results are written to.')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or DEFAULT_PATHS
+        results = {}
+        for profile in options['profiles'] or PROFILES:
+            results[profile] = self.load(profile, paths, options)
+            result = results[profile]
+            self.stdout.write(
+                f'{profile:<9} {result["throughput_rps"]:>8} rps  '
+                f'p50 {result["p50_ms"]:>8} ms  '
+                f'p99 {result["p99_ms"]:>8} ms  '
+                f'{result["errors"]} errors')
+        if {'baseline', 'tuned'} <= set(results):
+            gain = (results['tuned']['throughput_rps']
+                    / results['baseline']['throughput_rps'])
+            self.stdout.write(f'Throughput gain: {gain:.1f}x')
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(results, file, indent=2)
+
+    def load(self, profile, paths, options):
+        port = free_port()
+        command = (
+            sys.executable, '-c', GUNICORN, *PROFILES[profile],
+            '--bind', f'127.0.0.1:{port}', 'api_yamdb.wsgi:application')
+        env = {
+            **os.environ,
+            'GUNICORN_ACCESS_LOG': '',
+            'REQUEST_TIMING_ENABLED': 'False',
+        }
+        server = subprocess.Popen(
+            command, cwd=settings.BASE_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(port, timeout=60)
+            return run_clients(
+                port, paths, options['concurrency'], options['duration'])
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
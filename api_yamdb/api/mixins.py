@@ -0,0 +1,148 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import mixins, status
+from rest_framework.response import Response
+
+from api_yamdb import metrics
+from api_yamdb.db_routers import use_primary_since
+
+from .cache import get_versions, response_key, versions_digest
+from .serializers import requested_fields
+
+
+class ConditionalGetMixin:
+    """Answer conditional GET requests without building the response.
+
+    ``cache_dependencies`` lists the models, as ``app_label.modelname``,
+    the responses are built from. Their version counters and the request
+    path make up the ``ETag`` and ``Last-Modified`` validators, so a
+    request carrying a matching ``If-None-Match`` or ``If-Modified-Since``
+    gets a 304 before the queryset is evaluated or serialized.
+    ``If-None-Match: *`` is left to the handler, which alone knows
+    whether the resource exists. Right after a dependency changed the
+    request reads from the primary database, as the replicas may not
+    have the change yet.
+    """
+    cache_dependencies = ()
+
+    def get_versions(self):
+        if not hasattr(self, '_versions'):
+            self._versions = get_versions(self.cache_dependencies)
+            use_primary_since(max(self._versions, default=0))
+        return self._versions
+
+    def get_validators(self, request):
+        versions = self.get_versions()
+        etag = quote_etag(versions_digest(
+            versions, request.get_full_path(), request.user.pk))
+        return etag, max(versions, default=0) // 10 ** 9
+
+    def get_response(self, handler, request, *args, **kwargs):
+        return handler(request, *args, **kwargs)
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = None
+        if request.META.get('HTTP_IF_NONE_MATCH', '').strip() != '*':
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.get_response(handler, request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK,
+                                    status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class ConditionalListModelMixin(ConditionalGetMixin, mixins.ListModelMixin):
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs)
+
+
+class ConditionalRetrieveModelMixin(ConditionalGetMixin,
+                                    mixins.RetrieveModelMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs)
+
+
+class VersionedCacheMixin(ConditionalGetMixin):
+    """Serve safe responses from the cache until a dependency changes.
+
+    The version counters of ``cache_dependencies`` are part of the cache
+    key, so bumping one of them invalidates the cached responses.
+    """
+
+    def get_response(self, handler, request, *args, **kwargs):
+        if not settings.API_CACHE_ENABLED:
+            return super().get_response(handler, request, *args, **kwargs)
+        key = response_key(self.get_versions(), request.get_full_path())
+        data = cache.get(key)
+        if data is not None:
+            metrics.increment(
+                'yamdb_cache_requests_total', cache='response', result='hit')
+            return Response(data)
+        metrics.increment(
+            'yamdb_cache_requests_total', cache='response', result='miss')
+        response = super().get_response(handler, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data)
+        return response
+
+
+class CachedListModelMixin(VersionedCacheMixin, ConditionalListModelMixin):
+    pass
+
+
+class CachedRetrieveModelMixin(VersionedCacheMixin,
+                               ConditionalRetrieveModelMixin):
+    pass
+
+
+class NestedResourceMixin:
+    """Serve a route nested under a parent without fetching the parent.
+
+    ``parent_lookups`` maps the lookups of ``parent_model`` to the URL
+    kwargs that identify the parent, and ``get_queryset`` filters by the
+    same ids. Whether the parent exists is only asked when a list comes
+    out empty, to answer 404 instead of an empty page, or before a
+    create; the answer is kept for the rest of the request.
+    """
+    parent_model = None
+    parent_lookups = {}
+
+    def parent_exists(self):
+        if not hasattr(self, '_parent_exists'):
+            self._parent_exists = self.parent_model.objects.filter(**{
+                lookup: self.kwargs[kwarg]
+                for lookup, kwarg in self.parent_lookups.items()
+            }).exists()
+        return self._parent_exists
+
+    def check_parent(self):
+        if not self.parent_exists():
+            raise Http404
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.check_parent()
+        return page
+
+
+class SparseFieldsViewMixin:
+    """Tell ``get_queryset`` which fields a read request asked for, so
+    that it loads only what the ``SparseFieldsMixin`` serializer shows."""
+
+    def get_requested_fields(self):
+        if self.action not in ('list', 'retrieve'):
+            return None
+        if not hasattr(self, '_requested_fields'):
+            self._requested_fields = requested_fields(
+                self.request, self.get_serializer_class().Meta.fields)
+        return self._requested_fields
@@ -0,0 +1,132 @@
+from collections import OrderedDict
+
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+NO_COUNT_VALUES = ('false', '0')
+
+
+class UncountedPage(Page):
+    def has_next(self):
+        return self.paginator.has_more
+
+
+class UncountedPaginator(Paginator):
+    """Paginator that reads one row past the page instead of counting.
+
+    It knows whether a next page exists, but not how many pages there
+    are: ``num_pages`` only counts up to the next page.
+    """
+    number = 0
+    has_more = False
+
+    @property
+    def num_pages(self):
+        return self.number + self.has_more
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        self.number = number
+        self.has_more = len(rows) > self.per_page
+        return UncountedPage(rows[:self.per_page], number, self)
+
+
+class ResourcePagination(PageNumberPagination):
+    """Page number pagination with a client page size up to a cap.
+
+    ``page_size`` picks the page size, up to ``max_page_size`` of the
+    resource. ``count=false`` skips the COUNT query, which on large sets
+    costs more than the page itself: the response then has no ``count``
+    and ``next`` is set when one more row exists.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.counted = request.query_params.get(
+            self.count_query_param, '').lower() not in NO_COUNT_VALUES
+        self.django_paginator_class = (
+            Paginator if self.counted else UncountedPaginator)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.counted:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class CursorSelectablePagination(ResourcePagination):
+    """Page number pagination with an opt-in keyset (cursor) mode.
+
+    Clients that send the ``cursor`` query parameter, empty for the first
+    page, are paginated by ``cursor_ordering`` without COUNT and OFFSET
+    queries and follow the ``next``/``previous`` links from then on.
+    Requests without it get the usual numbered pages.
+    """
+    cursor_query_param = 'cursor'
+    cursor_ordering = None
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = CursorPagination()
+        self.cursor_paginator.cursor_query_param = self.cursor_query_param
+        self.cursor_paginator.ordering = self.cursor_ordering
+        self.cursor_paginator.page_size = self.get_page_size(request)
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
+
+
+class UserPagination(ResourcePagination):
+    max_page_size = 100
+
+
+class CatalogPagination(ResourcePagination):
+    max_page_size = 100
+
+
+class TitlePagination(CursorSelectablePagination):
+    cursor_ordering = ('name', 'id')
+    max_page_size = 100
+
+
+class ReviewPagination(CursorSelectablePagination):
+    cursor_ordering = ('pub_date', 'id')
+    max_page_size = 100
+
+
+class CommentPagination(CursorSelectablePagination):
+    cursor_ordering = ('pub_date', 'id')
+    max_page_size = 200
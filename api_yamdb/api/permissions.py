@@ -53,3 +53,22 @@ class IsAdminOrReadOnly(permissions.BasePermission):
             or (request.user.is_authenticated
                 and request.user.is_admin)
         )
+
+
+class IsAdmin(permissions.BasePermission):
+
+    def has_permission(self, request, view):
+        return (
+            request.user.is_authenticated
+            and (request.user.is_admin or request.user.is_superuser)
+        )
+
+
+class IsAdminOrModerator(permissions.BasePermission):
+
+    def has_permission(self, request, view):
+        return (
+            request.user.is_authenticated
+            and (request.user.is_admin or request.user.is_moderator
+                 or request.user.is_superuser)
+        )
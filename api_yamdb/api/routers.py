@@ -1,4 +1,4 @@
-from rest_framework.routers import Route, SimpleRouter
+from rest_framework.routers import DynamicRoute, Route, SimpleRouter
 
 
 class CustomWithoutUpdateRouter(SimpleRouter):
@@ -11,6 +11,13 @@ class CustomWithoutUpdateRouter(SimpleRouter):
             detail=False,
             initkwargs={'suffix': 'List'}
         ),
+        # Before the detail route, so that a lookup does not shadow it.
+        DynamicRoute(
+            url=r'^{prefix}/{url_path}/$',
+            name='{basename}-{url_name}',
+            detail=False,
+            initkwargs={}
+        ),
         Route(
             url=r'^{prefix}/{lookup}/$',
             mapping={'get': 'retrieve',
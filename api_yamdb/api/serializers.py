@@ -1,14 +1,115 @@
+from collections import OrderedDict
+
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
-from django.shortcuts import get_object_or_404
-from rest_framework import serializers
-from reviews.models import Category, Comment, Genre, Review, Title
+from django.db import IntegrityError, connections, router, transaction
+from django.http import Http404
+from rest_framework import exceptions, permissions, serializers
+from rest_framework.fields import empty
+from rest_framework.settings import api_settings
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.signals import bulk_changed
 from users.models import User
 
+from api_yamdb.middleware import timed
 from api_yamdb.settings import MAX_SCORE, ME, MIN_SCORE
 
+from .throttling import (client_ident, is_verification_blocked,
+                         record_unknown_user, record_verification_failure,
+                         reset_verification_failures)
+
+BULK_BATCH_SIZE = 500
+
+
+def bulk_insert(model, objs):
+    """Insert the objects and set their ids on every database backend.
+
+    Only PostgreSQL returns the ids of a multi-row INSERT, other backends
+    insert the objects one by one.
+    """
+    connection = connections[router.db_for_write(model)]
+    if connection.features.can_return_ids_from_bulk_insert:
+        return model.objects.bulk_create(objs, batch_size=BULK_BATCH_SIZE)
+    for obj in objs:
+        obj.save(force_insert=True)
+    return objs
+
+
+def query_list(request, param):
+    """Return the comma separated names of a query parameter."""
+    if request is None:
+        return set()
+    return {
+        name.strip()
+        for name in request.query_params.get(param, '').split(',')
+        if name.strip()
+    }
+
+
+def requested_fields(request, available):
+    """Return the fields picked with ``fields`` and ``omit``, None if the
+    request picked none."""
+    picked = query_list(request, 'fields')
+    omitted = query_list(request, 'omit')
+    if not picked and not omitted:
+        return None
+    unknown = (picked | omitted) - set(available)
+    if unknown:
+        raise serializers.ValidationError({
+            'fields': [f'Неизвестные поля: {", ".join(sorted(unknown))}.']
+        })
+    return (picked or set(available)) - omitted
+
+
+class SparseFieldsMixin:
+    """Let the client pick the fields of the response.
+
+    ``fields`` lists the fields to keep and ``omit`` the fields to drop.
+    With ``fields`` the relations in ``compact_fields`` are rendered by
+    ``get_compact_field``, as slugs for one, unless ``expand`` lists them.
+    Only the responses to safe requests are trimmed, and only the
+    top-level serializer, not the nested ones.
+    """
+    compact_fields = ()
 
-class UserSerializer(serializers.ModelSerializer):
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.root is not self and self.root is not self.parent:
+            return fields
+        request = self.context.get('request')
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return fields
+        picked = requested_fields(request, fields)
+        if picked is None:
+            return fields
+        compacted = set()
+        if query_list(request, 'fields'):
+            compacted = set(self.compact_fields) - query_list(
+                request, 'expand')
+        return OrderedDict(
+            (name, self.get_compact_field(name, field)
+             if name in compacted else field)
+            for name, field in fields.items() if name in picked
+        )
+
+    def get_compact_field(self, name, field):
+        """Return the field rendering the relation ``name`` compactly."""
+        return field
+
+
+class TimedSerializerMixin:
+    """Count the serializer work in the ``serialize`` request timing."""
+
+    def to_representation(self, instance):
+        with timed('serialize'):
+            return super().to_representation(instance)
+
+    def run_validation(self, data=empty):
+        with timed('serialize'):
+            return super().run_validation(data)
+
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         fields = (
             'username', 'email', 'first_name', 'last_name', 'bio', 'role')
@@ -22,14 +123,14 @@ class UserSerializer(serializers.ModelSerializer):
         super().save()
 
 
-class UserMeSerializer(serializers.ModelSerializer):
+class UserMeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         fields = (
             'username', 'email', 'first_name', 'last_name', 'bio', 'role')
         model = User
 
 
-class UserSignupSerializer(serializers.ModelSerializer):
+class UserSignupSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         fields = ('username', 'email')
         model = User
@@ -41,36 +142,50 @@ class UserSignupSerializer(serializers.ModelSerializer):
             'Регистрация', f'confirmation_code: {confirmation_code}')
 
 
-class TokenSerializer(serializers.Serializer):
-    username = serializers.ModelField(
-        model_field=User()._meta.get_field('username'))
+class TokenSerializer(TimedSerializerMixin, serializers.Serializer):
+    username = serializers.CharField(max_length=150)
     confirmation_code = serializers.CharField()
 
-    def validate_confirmation_code(self, value):
-        username = self.initial_data.get('username')
-        if not username:
-            raise serializers.ValidationError()
-        user = get_object_or_404(User, username=username)
-        if not default_token_generator.check_token(user, value):
-            raise serializers.ValidationError('Некорректные данные.')
+    def validate(self, data):
+        """Check the confirmation code and pass the user on to the view."""
+        username = data['username']
+        client = client_ident(self.context['request'])
+        if is_verification_blocked(username, client):
+            raise exceptions.Throttled(
+                wait=settings.TOKEN_FAILED_ATTEMPTS_WINDOW)
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            record_unknown_user(client)
+            raise Http404
+        if not default_token_generator.check_token(
+                user, data['confirmation_code']):
+            record_verification_failure(username, client)
+            raise serializers.ValidationError(
+                {'confirmation_code': 'Некорректные данные.'})
+        reset_verification_failures(username, client)
+        data['user'] = user
+        return data
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         exclude = ('id',)
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         exclude = ('id',)
 
 
-class TitleGetSerializer(serializers.ModelSerializer):
+class TitleGetSerializer(SparseFieldsMixin, TimedSerializerMixin,
+                         serializers.ModelSerializer):
     genre = GenreSerializer(read_only=True, many=True)
     category = CategorySerializer(read_only=True)
-    rating = serializers.SerializerMethodField()
+    rating = serializers.FloatField(read_only=True)
+    compact_fields = ('genre', 'category')
 
     class Meta:
         model = Title
@@ -78,12 +193,12 @@ class TitleGetSerializer(serializers.ModelSerializer):
                   'genre', 'category', 'rating')
         read_only_fields = ('id',)
 
-    def get_rating(self, obj):
-        rating = obj.reviews.aggregate(Avg('score'))
-        return rating.get('score__avg')
+    def get_compact_field(self, name, field):
+        return serializers.SlugRelatedField(
+            slug_field='slug', read_only=True, many=name == 'genre')
 
 
-class TitlePostSerializer(serializers.ModelSerializer):
+class TitlePostSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
         slug_field='slug',
         queryset=Category.objects.all()
@@ -95,11 +210,13 @@ class TitlePostSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = (
+            'rating_sum', 'rating_count', 'rating', 'search_vector')
         model = Title
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, TimedSerializerMixin,
+                       serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username'
@@ -115,21 +232,20 @@ class ReviewSerializer(serializers.ModelSerializer):
                 'Оценка должна быть от 0 до 10')
         return value
 
-    def validate(self, data):
-        if self.context['request'].method != 'POST':
-            return data
-        title = self.context['view'].kwargs.get('title_id')
-        author = self.context['request'].user
-        if Review.objects.filter(
-                title_id=title, author=author
-        ).exists():
-            raise serializers.ValidationError(
-                'Вы оставляли отзыв на произведение'
-            )
-        return data
+    def create(self, validated_data):
+        """Insert the review, the unique constraint rejects a second one
+        by the same author, even from a concurrent request."""
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Вы оставляли отзыв на произведение'
+                ]
+            })
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username'
@@ -138,3 +254,173 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ('id', 'text', 'author', 'pub_date')
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """Validate and create a batch of objects with a few queries.
+
+    The child serializer validates every item without queries, then its
+    ``validate_batch`` checks the valid items against the database at
+    once and returns the errors of each, and ``create_batch`` writes the
+    batch in one transaction. Nothing is written unless every item is
+    valid.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if len(data) > settings.BULK_MAX_ITEMS:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'Не больше {settings.BULK_MAX_ITEMS} объектов '
+                    'в одном запросе.'
+                ]
+            })
+        items = []
+        errors = []
+        for item in data:
+            try:
+                items.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                errors.append(exc.detail)
+        # The items with field errors are not checked against the database.
+        batch_errors = iter(self.child.validate_batch(items))
+        errors = [error or next(batch_errors) for error in errors]
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            return self.child.create_batch(validated_data)
+
+
+def missing_object(field, value):
+    return f'Объект с {field}={value} не существует.'
+
+
+class TitleBulkSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
+
+    class Meta:
+        model = Title
+        fields = ('name', 'year', 'description', 'category', 'genre')
+        list_serializer_class = BulkListSerializer
+
+    def validate_batch(self, items):
+        """Resolve the category and genre slugs of the batch at once."""
+        categories = dict(Category.objects.filter(
+            slug__in={item['category'] for item in items}
+        ).values_list('slug', 'id'))
+        genres = dict(Genre.objects.filter(
+            slug__in={slug for item in items for slug in item['genre']}
+        ).values_list('slug', 'id'))
+        errors = []
+        for item in items:
+            item_errors = {}
+            if item['category'] not in categories:
+                item_errors['category'] = [
+                    missing_object('slug', item['category'])]
+            unknown = [slug for slug in item['genre'] if slug not in genres]
+            if unknown:
+                item_errors['genre'] = [
+                    missing_object('slug', slug) for slug in unknown]
+            errors.append(item_errors)
+            item['category'] = categories.get(item['category'])
+            item['genre'] = {genres.get(slug) for slug in item['genre']}
+        return errors
+
+    def create_batch(self, items):
+        titles = bulk_insert(Title, [
+            Title(name=item['name'], year=item['year'],
+                  description=item.get('description', ''),
+                  category_id=item['category'])
+            for item in items
+        ])
+        GenreTitle.objects.bulk_create((
+            GenreTitle(title_id=title.pk, genre_id=genre_id)
+            for title, item in zip(titles, items)
+            for genre_id in item['genre']
+        ), batch_size=BULK_BATCH_SIZE)
+        Title.objects.filter(
+            pk__in=[title.pk for title in titles]).update_search_vector()
+        bulk_changed.send(sender=self.__class__, models=[Title, GenreTitle])
+        return titles
+
+
+class ReviewBulkSerializer(ReviewSerializer):
+    author = serializers.CharField(max_length=150)
+
+    class Meta(ReviewSerializer.Meta):
+        list_serializer_class = BulkListSerializer
+
+    def validate_batch(self, items):
+        """Look up the authors and their reviews of the title at once."""
+        title_id = self.context['view'].kwargs['title_id']
+        authors = User.objects.filter(
+            username__in={item['author'] for item in items}
+        ).in_bulk(field_name='username')
+        reviewed = set(Review.objects.filter(
+            title_id=title_id, author__in=authors.values()
+        ).values_list('author__username', flat=True))
+        errors = []
+        for item in items:
+            username = item['author']
+            if username not in authors:
+                errors.append({
+                    'author': [missing_object('username', username)]})
+            elif username in reviewed:
+                errors.append({
+                    'author': ['Автор уже оставлял отзыв на произведение']})
+            else:
+                errors.append({})
+            reviewed.add(username)
+            item['author'] = authors.get(username)
+        return errors
+
+    def create_batch(self, items):
+        """Insert the reviews and add their scores to the title rating.
+
+        The unique constraint rejects the batch if a concurrent request
+        added a review by one of the authors after the validation.
+        """
+        title_id = self.context['view'].kwargs['title_id']
+        try:
+            with transaction.atomic():
+                reviews = Review.objects.bulk_create((
+                    Review(title_id=title_id, author=item['author'],
+                           text=item['text'], score=item.get('score'))
+                    for item in items
+                ), batch_size=BULK_BATCH_SIZE)
+                if reviews and reviews[0].pk is None:
+                    # A title has one review per author, which identifies
+                    # them.
+                    ids = dict(Review.objects.filter(
+                        title_id=title_id,
+                        author__in=[review.author for review in reviews]
+                    ).values_list('author_id', 'id'))
+                    for review in reviews:
+                        review.pk = ids[review.author_id]
+                scores = [review.score for review in reviews
+                          if review.score is not None]
+                Title.objects.filter(pk=title_id).shift_rating(
+                    sum(scores), len(scores))
+        except IntegrityError:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Автор из пакета уже оставлял отзыв на произведение'
+                ]
+            })
+        bulk_changed.send(sender=self.__class__, models=[Review, Title])
+        return reviews
+
+
+class CommentBulkDeleteSerializer(TimedSerializerMixin,
+                                  serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BULK_MAX_ITEMS
+    )
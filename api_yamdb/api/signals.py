@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.signals import bulk_changed
+from users.models import User
+
+from .authentication import forget_user
+from .cache import bump_version
+
+VERSIONED_MODELS = (
+    Category, Genre, Title, GenreTitle, Review, Comment, User
+)
+
+
+def bump_model_version(sender, **kwargs):
+    """Bump the cache version of the changed model once it is committed."""
+    label = sender._meta.label_lower
+    transaction.on_commit(lambda: bump_version(label))
+
+
+def bump_relation_version(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_model_version(sender)
+
+
+def forget_cached_user(sender, instance, **kwargs):
+    """Drop the user from the caches now and again once committed, as a
+    process may load the old row meanwhile."""
+    user_id = instance.pk
+    forget_user(user_id)
+    transaction.on_commit(lambda: forget_user(user_id))
+
+
+def bump_bulk_versions(sender, models, **kwargs):
+    for model in models:
+        bump_model_version(model)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_model_version, sender=model)
+    post_delete.connect(bump_model_version, sender=model)
+m2m_changed.connect(bump_relation_version, sender=GenreTitle)
+post_save.connect(forget_cached_user, sender=User)
+post_delete.connect(forget_cached_user, sender=User)
+bulk_changed.connect(bump_bulk_versions)
@@ -0,0 +1,69 @@
+"""Limits on wrong confirmation codes.
+
+A client gets TOKEN_MAX_FAILED_ATTEMPTS wrong codes per username and
+TOKEN_MAX_CLIENT_FAILED_ATTEMPTS in all, so nobody can lock a user out
+from another address. The failures are counted in the default cache:
+the limits hold for all the server processes only if they share it.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+FAILURES_KEY = 'api:token-failures:{}'
+CLIENT_FAILURES_KEY = 'api:token-client-failures:{}'
+
+
+def client_ident(request):
+    """Return the client address the way the DRF throttles find it."""
+    return BaseThrottle().get_ident(request)
+
+
+def failures_key(username, client):
+    return FAILURES_KEY.format(
+        hashlib.md5(f'{client} {username}'.encode()).hexdigest())
+
+
+def client_failures_key(client):
+    return CLIENT_FAILURES_KEY.format(
+        hashlib.md5(client.encode()).hexdigest())
+
+
+def is_verification_blocked(username, client):
+    """Tell whether the client ran out of confirmation code attempts for
+    the username or for all of them."""
+    key, client_key = failures_key(username, client), client_failures_key(
+        client)
+    failures = cache.get_many((key, client_key))
+    return (
+        failures.get(key, 0) >= settings.TOKEN_MAX_FAILED_ATTEMPTS
+        or failures.get(client_key, 0) >= (
+            settings.TOKEN_MAX_CLIENT_FAILED_ATTEMPTS)
+    )
+
+
+def increment(key):
+    if cache.add(key, 1, timeout=settings.TOKEN_FAILED_ATTEMPTS_WINDOW):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=settings.TOKEN_FAILED_ATTEMPTS_WINDOW)
+
+
+def record_verification_failure(username, client):
+    increment(failures_key(username, client))
+    increment(client_failures_key(client))
+
+
+def record_unknown_user(client):
+    """Count a code sent for a missing username against the client, or
+    it could probe usernames without limit."""
+    increment(client_failures_key(client))
+
+
+def reset_verification_failures(username, client):
+    """Forget the failures for the username; the client total stays, or a
+    client could reset it with a code of its own."""
+    cache.delete(failures_key(username, client))
@@ -4,8 +4,8 @@ from rest_framework.routers import DefaultRouter
 
 from .routers import CustomWithoutUpdateRouter
 from .views import (CategoriesViewSet, CommentViewSet, GenresViewSet,
-                    ReviewViewSet, TitlesViewSet, UserViewSet, get_token,
-                    signup)
+                    ReviewViewSet, TitlesViewSet, UserViewSet, database_pools,
+                    export, get_token, signup)
 
 router = DefaultRouter()
 custom_router = CustomWithoutUpdateRouter()
@@ -29,4 +29,6 @@ urlpatterns = [
     path('v1/', include(custom_router.urls)),
     path('v1/auth/signup/', signup, name='signup'),
     path('v1/auth/token/', get_token, name='token'),
+    path('v1/db-pools/', database_pools, name='db-pools'),
+    path('v1/export/<str:export_format>/', export, name='export'),
 ]
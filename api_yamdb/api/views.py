@@ -1,32 +1,44 @@
-from django.db.models import Avg
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, mixins, permissions, viewsets
-from rest_framework.decorators import api_view
+from rest_framework import filters, mixins, permissions, status, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.generics import get_object_or_404
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import AccessToken
-from reviews.models import Category, Genre, Review, Title
+from reviews.export import EXPORT_FORMATS, render_export
+from reviews.models import Category, Comment, Genre, Review, Title
 from users.models import User
 
+from api_yamdb.db_backends.postgresql_pool.pool import pool_stats
 from api_yamdb.settings import ME
 
 from .filters import TitleFilter
-from .permissions import (IsAdminOrReadOnly, IsModeratorAuthorOrReadOnly,
-                          ReadOnlyPermission, UserPermissions)
-from .serializers import (CategorySerializer, CommentSerializer,
-                          GenreSerializer, ReviewSerializer,
-                          TitleGetSerializer, TitlePostSerializer,
-                          TokenSerializer, UserSerializer,
+from .mixins import (CachedListModelMixin, CachedRetrieveModelMixin,
+                     ConditionalListModelMixin, ConditionalRetrieveModelMixin,
+                     NestedResourceMixin, SparseFieldsViewMixin)
+from .pagination import (CatalogPagination, CommentPagination,
+                         ReviewPagination, TitlePagination, UserPagination)
+from .permissions import (IsAdmin, IsAdminOrModerator, IsAdminOrReadOnly,
+                          IsModeratorAuthorOrReadOnly, ReadOnlyPermission,
+                          UserPermissions)
+from .serializers import (CategorySerializer, CommentBulkDeleteSerializer,
+                          CommentSerializer, GenreSerializer,
+                          ReviewBulkSerializer, ReviewSerializer,
+                          TitleBulkSerializer, TitleGetSerializer,
+                          TitlePostSerializer, TokenSerializer, UserSerializer,
                           UserSignupSerializer)
 
 
-class UserViewSet(viewsets.ModelViewSet):
-    queryset = User.objects.all()
+class UserViewSet(ConditionalListModelMixin,
+                  ConditionalRetrieveModelMixin,
+                  viewsets.ModelViewSet):
+    queryset = User.objects.order_by('username')
+    cache_dependencies = ('users.user',)
     serializer_class = UserSerializer
     lookup_field = 'username'
     permission_classes = (UserPermissions,)
-    pagination_class = PageNumberPagination
+    pagination_class = UserPagination
 
     def get_object(self):
         if self.kwargs['username'] == ME:
@@ -48,21 +60,47 @@ def signup(request):
 
 @api_view(['POST'])
 def get_token(request):
-    serializer = TokenSerializer(data=request.data)
+    serializer = TokenSerializer(
+        data=request.data, context={'request': request})
     serializer.is_valid(raise_exception=True)
-    username = serializer.initial_data.get('username')
-    user = get_object_or_404(User, username=username)
-    token = str(AccessToken().for_user(user))
+    token = str(AccessToken.for_user(serializer.validated_data['user']))
     return Response({'token': token})
 
 
-class CategoriesGenresBaseViewSet(mixins.ListModelMixin,
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+@api_view(['GET'])
+@permission_classes((IsAdmin,))
+def export(request, export_format):
+    if export_format not in EXPORT_FORMATS:
+        raise Http404
+    response = StreamingHttpResponse(
+        render_export(export_format),
+        content_type=EXPORT_CONTENT_TYPES[export_format]
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="catalogue.{export_format}"')
+    return response
+
+
+@api_view(['GET'])
+@permission_classes((IsAdmin,))
+def database_pools(request):
+    """Connection pool counters of the worker process that answers."""
+    return Response(pool_stats())
+
+
+class CategoriesGenresBaseViewSet(CachedListModelMixin,
                                   mixins.CreateModelMixin,
                                   mixins.DestroyModelMixin,
                                   viewsets.GenericViewSet):
 
     permission_classes = (UserPermissions | ReadOnlyPermission,)
-    pagination_class = PageNumberPagination
+    pagination_class = CatalogPagination
     filter_backends = (DjangoFilterBackend, filters.SearchFilter)
     search_fields = ('name',)
     lookup_field = 'slug'
@@ -71,6 +109,7 @@ class CategoriesGenresBaseViewSet(mixins.ListModelMixin,
 
 class CategoriesViewSet(CategoriesGenresBaseViewSet):
     queryset = Category.objects.all()
+    cache_dependencies = ('reviews.category',)
     search_fields = ('name',)
     serializer_class = CategorySerializer
     permission_classes = (IsAdminOrReadOnly,)
@@ -78,69 +117,150 @@ class CategoriesViewSet(CategoriesGenresBaseViewSet):
 
 class GenresViewSet(CategoriesGenresBaseViewSet):
     queryset = Genre.objects.all()
-    pagination_class = PageNumberPagination
+    cache_dependencies = ('reviews.genre',)
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrReadOnly,)
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')
+class TitlesViewSet(SparseFieldsViewMixin,
+                    CachedListModelMixin,
+                    CachedRetrieveModelMixin,
+                    viewsets.ModelViewSet):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').defer('search_vector')
+    cache_dependencies = (
+        'reviews.title', 'reviews.genre', 'reviews.category',
+        'reviews.genretitle', 'reviews.review',
     )
     permission_classes = (IsAdminOrReadOnly,)
-    pagination_class = PageNumberPagination
+    pagination_class = TitlePagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
 
+    def get_queryset(self):
+        fields = self.get_requested_fields()
+        if fields is None:
+            return super().get_queryset()
+        queryset = Title.objects.only(
+            'id', *fields & {
+                'name', 'year', 'description', 'rating', 'category'}
+        ).prefetch_related(*fields & {'genre'})
+        if 'category' in fields:
+            return queryset.select_related('category')
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'create' or self.action == 'partial_update':
             return TitlePostSerializer
         return TitleGetSerializer
 
+    @action(detail=False, methods=['post'], url_path='bulk',
+            permission_classes=(IsAdmin,))
+    def bulk_create(self, request):
+        """Create a list of titles with their genres in one transaction."""
+        serializer = TitleBulkSerializer(
+            data=request.data, many=True,
+            context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        titles = serializer.save()
+        created = self.get_queryset().in_bulk(
+            [title.pk for title in titles])
+        return Response(
+            TitleGetSerializer(
+                [created[title.pk] for title in titles], many=True).data,
+            status=status.HTTP_201_CREATED
+        )
 
-class ReviewViewSet(viewsets.ModelViewSet):
+
+class ReviewViewSet(SparseFieldsViewMixin,
+                    NestedResourceMixin,
+                    ConditionalListModelMixin,
+                    ConditionalRetrieveModelMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    cache_dependencies = ('reviews.review',)
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly,
         IsModeratorAuthorOrReadOnly,
     )
-    pagination_class = PageNumberPagination
+    pagination_class = ReviewPagination
+    parent_model = Title
+    parent_lookups = {'pk': 'title_id'}
 
     def perform_create(self, serializer):
-        title = get_object_or_404(
-            Title,
-            pk=self.kwargs.get('title_id')
-        )
-        serializer.save(
-            author=self.request.user, title=title
-        )
+        try:
+            serializer.save(
+                author=self.request.user, title_id=self.kwargs.get('title_id')
+            )
+        except Title.DoesNotExist:
+            raise Http404
 
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        return title.reviews.all()
+        queryset = Review.objects.filter(title_id=self.kwargs.get('title_id'))
+        fields = self.get_requested_fields()
+        if fields is not None and 'text' not in fields:
+            queryset = queryset.defer('text')
+        if fields is None or 'author' in fields:
+            return queryset.select_related('author')
+        return queryset
+
+    @action(detail=False, methods=['post'], url_path='bulk',
+            permission_classes=(IsAdminOrModerator,))
+    def bulk_create(self, request, title_id):
+        """Import a list of reviews of the title by the given authors."""
+        self.check_parent()
+        serializer = ReviewBulkSerializer(
+            data=request.data, many=True,
+            context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(NestedResourceMixin,
+                     ConditionalListModelMixin,
+                     ConditionalRetrieveModelMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
+    cache_dependencies = ('reviews.comment',)
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly,
         IsModeratorAuthorOrReadOnly,
     )
-    pagination_class = PageNumberPagination
+    pagination_class = CommentPagination
+    parent_model = Review
+    parent_lookups = {'pk': 'review_id', 'title_id': 'title_id'}
 
     def perform_create(self, serializer):
-        review = get_object_or_404(
-            Review,
-            pk=self.kwargs.get('review_id')
-        )
+        self.check_parent()
         serializer.save(
-            author=self.request.user, review=review
+            author=self.request.user, review_id=self.kwargs.get('review_id')
         )
 
     def get_queryset(self):
-        review = get_object_or_404(
-            Review,
-            pk=self.kwargs.get('review_id')
-        )
-        return review.comments.all()
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id')
+        ).select_related('author')
+
+    @action(detail=False, methods=['delete'], url_path='bulk',
+            permission_classes=(IsAdminOrModerator,))
+    def bulk_destroy(self, request, title_id, review_id):
+        """Delete the listed comments of the review.
+
+        Every id gets a result: 204 if it was deleted, 404 if the review
+        has no such comment.
+        """
+        serializer = CommentBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        with transaction.atomic():
+            found = set(self.get_queryset().filter(
+                pk__in=ids).values_list('pk', flat=True))
+            Comment.objects.filter(pk__in=found).delete()
+        return Response([
+            {'id': pk, 'status': status.HTTP_204_NO_CONTENT if pk in found
+             else status.HTTP_404_NOT_FOUND}
+            for pk in ids
+        ])
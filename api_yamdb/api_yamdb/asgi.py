@@ -2,15 +2,21 @@
 ASGI config for YaMDb project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with gunicorn and uvicorn workers:
 
-For more information on this file, see
-https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
+    gunicorn api_yamdb.asgi:application -k uvicorn.workers.UvicornWorker
+
+Django 2.2 has no ASGI handler, so the WSGI application is wrapped: the
+title, review and comment lists run in a bounded thread pool, the other
+requests through asgiref's WsgiToAsgi.
 """
 
 import os
 
-from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+
+from .asgi_handlers import AsyncReadApplication
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+application = AsyncReadApplication(get_wsgi_application())
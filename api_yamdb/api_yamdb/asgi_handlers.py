@@ -0,0 +1,91 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+READ_METHODS = ('GET', 'HEAD')
+READ_ROUTES = ('titles-list', 'reviews-list', 'comments-list')
+
+
+class BufferedResponse:
+    """Run a WSGI application and keep the whole response in memory."""
+
+    def __init__(self, wsgi_application, environ):
+        self.status = 500
+        self.headers = []
+        result = wsgi_application(environ, self.start_response)
+        try:
+            self.body = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+    def start_response(self, status, headers, exc_info=None):
+        self.status = int(status.split(' ', 1)[0])
+        self.headers = [
+            (name.lower().encode('ascii'), value.encode('latin1'))
+            for name, value in headers
+        ]
+
+
+class AsyncReadApplication:
+    """ASGI application serving the catalogue lists off the event loop.
+
+    GET and HEAD requests for ``READ_ROUTES`` run Django in a pool of
+    ``ASGI_READ_THREADS`` threads, which also bounds their database
+    connections. The response is buffered and sent from the event loop,
+    so a slow client holds a coroutine rather than a thread. Everything
+    else goes through asgiref's ``WsgiToAsgi``.
+    """
+
+    def __init__(self, wsgi_application, threads=None):
+        self.wsgi_application = wsgi_application
+        self.fallback = WsgiToAsgi(wsgi_application)
+        self.executor = ThreadPoolExecutor(
+            max_workers=threads or settings.ASGI_READ_THREADS,
+            thread_name_prefix='asgi-read')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http' and self.is_read(scope):
+            await self.read(scope, receive, send)
+        else:
+            await self.fallback(scope, receive, send)
+
+    @staticmethod
+    def is_read(scope):
+        if scope['method'] not in READ_METHODS:
+            return False
+        try:
+            return resolve(scope['path']).url_name in READ_ROUTES
+        except Resolver404:
+            return False
+
+    async def read(self, scope, receive, send):
+        # WsgiToAsgiInstance only reads the scope to build the environ.
+        instance = WsgiToAsgiInstance(self.wsgi_application)
+        instance.scope = scope
+        environ = instance.build_environ(scope, BytesIO())
+        response = await asyncio.get_event_loop().run_in_executor(
+            self.executor, BufferedResponse, self.wsgi_application, environ)
+        await send({
+            'type': 'http.response.start',
+            'status': response.status,
+            'headers': response.headers,
+        })
+        body = b'' if scope['method'] == 'HEAD' else response.body
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
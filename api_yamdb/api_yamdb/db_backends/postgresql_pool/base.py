@@ -0,0 +1,42 @@
+import os
+
+from django.db.backends.postgresql import base
+
+from .pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend that borrows connections from a process pool.
+
+    Django closes a connection after ``CONN_MAX_AGE`` or an error; this
+    backend puts it back into the pool instead, rolled back. The age is
+    always 0, so the connection goes back at the end of every request: a
+    thread keeping it while idle would leave the others waiting.
+    """
+    pool = None
+
+    def __init__(self, settings_dict, *args, **kwargs):
+        super().__init__(
+            {**settings_dict, 'CONN_MAX_AGE': 0}, *args, **kwargs)
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(self.alias, self.settings_dict, conn_params)
+        connection = self.pool.checkout()
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        # A connection inherited through fork belongs to the parent.
+        if self.pool.pid != os.getpid():
+            return
+        with self.wrap_database_errors:
+            self.pool.checkin(self.connection)
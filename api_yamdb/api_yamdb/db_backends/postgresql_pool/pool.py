@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+
+import psycopg2
+from django.core.exceptions import ImproperlyConfigured
+from psycopg2 import extensions, pool
+
+ENGINE = 'api_yamdb.db_backends.postgresql_pool'
+
+# Database alias -> ConnectionPool of the current process.
+_pools = {}
+_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """Thread safe pool of PostgreSQL connections with checkout checks.
+
+    Up to ``min_size`` idle connections are kept open, ``max_size`` limits
+    the connections in use; a checkout waits ``timeout`` seconds for a
+    free one. A connection idle for more than ``check_interval`` seconds
+    is pinged before it is handed out and replaced if the ping fails.
+    Checking in a connection that is not checked out does nothing.
+    """
+
+    def __init__(self, min_size, max_size, timeout, check_interval,
+                 **conn_params):
+        self.pool = pool.ThreadedConnectionPool(
+            min_size, max_size, **conn_params)
+        self.pid = os.getpid()
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.lock = threading.Lock()
+        # id() of the connections checked out.
+        self.in_use = set()
+        # id() of an idle connection -> when it was returned.
+        self.returned = {}
+        self.checkouts = 0
+        self.waits = 0
+        self.discarded = 0
+
+    def checkout(self):
+        if not self.slots.acquire(blocking=False):
+            self.waits += 1
+            if not self.slots.acquire(timeout=self.timeout):
+                raise psycopg2.OperationalError(
+                    f'No free connection in the pool after {self.timeout}s.')
+        try:
+            connection = self.pool.getconn()
+            # Every idle connection is tried at most once, then the pool
+            # opens a new one.
+            while not self.is_usable(connection):
+                self.discarded += 1
+                self.pool.putconn(connection, close=True)
+                connection = self.pool.getconn()
+        except Exception:
+            self.slots.release()
+            raise
+        with self.lock:
+            self.in_use.add(id(connection))
+            self.checkouts += 1
+        return connection
+
+    def checkin(self, connection):
+        with self.lock:
+            if id(connection) not in self.in_use:
+                return
+            self.in_use.remove(id(connection))
+        if not connection.closed:
+            self.returned[id(connection)] = time.monotonic()
+        try:
+            self.pool.putconn(connection)
+        finally:
+            self.slots.release()
+
+    def is_usable(self, connection):
+        returned = self.returned.pop(id(connection), None)
+        if connection.closed:
+            return False
+        if returned is None or (
+                time.monotonic() - returned < self.check_interval):
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if connection.info.transaction_status != (
+                    extensions.TRANSACTION_STATUS_IDLE):
+                connection.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    def stats(self):
+        return {
+            'max_size': self.max_size,
+            'in_use': len(self.pool._used),
+            'idle': len(self.pool._pool),
+            'checkouts': self.checkouts,
+            'waits': self.waits,
+            'discarded': self.discarded,
+        }
+
+
+def get_pool(alias, settings_dict, conn_params):
+    """Return the pool of the database alias, creating it on first use.
+
+    Pools are per process: a pool inherited through ``fork`` (gunicorn
+    ``preload_app``) is dropped without closing the parent's sockets.
+    """
+    connection_pool = _pools.get(alias)
+    if connection_pool is not None and connection_pool.pid == os.getpid():
+        return connection_pool
+    with _lock:
+        connection_pool = _pools.get(alias)
+        if connection_pool is None or connection_pool.pid != os.getpid():
+            options = settings_dict.get('POOL', {})
+            connection_pool = ConnectionPool(
+                options.get('MIN_SIZE', 1),
+                options.get('MAX_SIZE', 5),
+                options.get('TIMEOUT', 10),
+                options.get('CHECK_INTERVAL', 30),
+                **conn_params)
+            _pools[alias] = connection_pool
+    return connection_pool
+
+
+def check_pool_size(databases, threads):
+    """Refuse to run more threads per process than a pool has connections.
+
+    Threads past ``MAX_SIZE`` would wait for a connection and fail after
+    ``TIMEOUT`` whenever the others are all busy.
+    """
+    for alias, settings_dict in databases.items():
+        if settings_dict['ENGINE'] != ENGINE:
+            continue
+        max_size = settings_dict.get('POOL', {}).get('MAX_SIZE', 5)
+        if threads > max_size:
+            raise ImproperlyConfigured(
+                f'{threads} threads per process cannot share the '
+                f'{max_size} connections of the {alias} database pool: '
+                'raise DB_POOL_MAX_SIZE or run fewer threads.')
+
+
+def pool_stats():
+    """Return the pool counters of the current process by database alias."""
+    return {
+        alias: connection_pool.stats()
+        for alias, connection_pool in _pools.items()
+        if connection_pool.pid == os.getpid()
+    }
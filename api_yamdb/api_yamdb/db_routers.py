@@ -0,0 +1,115 @@
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+# Replication lag in seconds, zero when the replica replayed everything
+# it received: pg_last_xact_replay_timestamp() alone keeps growing on an
+# idle primary.
+LAG_SQL = (
+    'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() '
+    'THEN 0 ELSE EXTRACT(EPOCH FROM now() - '
+    'pg_last_xact_replay_timestamp()) END'
+)
+
+_state = threading.local()
+# Replica alias -> (monotonic time of the check, healthy).
+_health = {}
+
+
+def start_replica_reads():
+    """Send the reads of the current thread to a replica until stopped."""
+    _state.replica = True
+    _state.alias = None
+    _state.wrote = False
+
+
+def stop_replica_reads():
+    """Go back to the primary, return whether anything was written."""
+    try:
+        return getattr(_state, 'wrote', False)
+    finally:
+        _state.replica = False
+        _state.alias = None
+        _state.wrote = False
+
+
+def use_primary():
+    """Read from the primary for the rest of the current request."""
+    _state.replica = False
+
+
+def use_primary_since(changed_at):
+    """Read from the primary if a change at ``changed_at`` (in ns) may
+    not have reached the replicas yet."""
+    age = time.time_ns() - changed_at
+    if age < settings.REPLICA_MAX_LAG * 10 ** 9:
+        use_primary()
+
+
+def replica_lag(alias):
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        connection.ensure_connection()
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(LAG_SQL)
+        lag = cursor.fetchone()[0]
+    return float(lag or 0)
+
+
+def is_healthy(alias):
+    """Tell whether the replica is reachable and close enough to the
+    primary, checking at most once per ``REPLICA_CHECK_INTERVAL``."""
+    now = time.monotonic()
+    checked_at, healthy = _health.get(alias, (None, False))
+    if checked_at is not None and now - checked_at < (
+            settings.REPLICA_CHECK_INTERVAL):
+        return healthy
+    try:
+        healthy = replica_lag(alias) <= settings.REPLICA_MAX_LAG
+    except DatabaseError:
+        connections[alias].close()
+        healthy = False
+    _health[alias] = (now, healthy)
+    return healthy
+
+
+def choose_replica():
+    replicas = [
+        alias for alias in settings.REPLICA_DATABASES if is_healthy(alias)
+    ]
+    return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+
+class ReplicaRouter:
+    """Route reads to a healthy replica while replica reads are on.
+
+    ``ReplicaMiddleware`` turns them on for safe requests. A request
+    sticks to one replica and falls back to the primary when none is
+    healthy. The first write moves the rest of the request to the
+    primary, so it reads what it has just written.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not getattr(_state, 'replica', False):
+            return DEFAULT_DB_ALIAS
+        if _state.alias is None:
+            _state.alias = choose_replica()
+        return _state.alias
+
+    def db_for_write(self, model, **hints):
+        _state.replica = False
+        _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
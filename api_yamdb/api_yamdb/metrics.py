@@ -0,0 +1,250 @@
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+
+from .db_backends.postgresql_pool.pool import pool_stats
+
+HISTOGRAM_BUCKETS = {
+    'yamdb_request_duration_seconds': (
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    'yamdb_request_db_queries': (0, 1, 2, 3, 5, 10, 20, 50, 100),
+    'yamdb_request_db_duration_seconds': (
+        0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+    'yamdb_response_size_bytes': (
+        256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+}
+HELP = {
+    'yamdb_requests_total': 'Requests by route name, method and status.',
+    'yamdb_request_duration_seconds': 'Request latency by route name.',
+    'yamdb_request_db_queries': 'Database queries per request.',
+    'yamdb_request_db_duration_seconds': 'Database time per request.',
+    'yamdb_response_size_bytes': 'Response body size by route name.',
+    'yamdb_cache_requests_total': 'Cache lookups by cache and result.',
+    'yamdb_db_pool_connections': 'Pooled database connections by state.',
+    'yamdb_db_pool_events_total': 'Pool checkouts, waits and discards.',
+    'yamdb_worker_last_flush_timestamp_seconds':
+        'When a worker process last wrote its metrics.',
+}
+
+_lock = threading.Lock()
+_state = {'pid': None, 'flushed': 0.0}
+# (name, labels) -> value
+_counters = defaultdict(float)
+# (name, labels) -> [per bucket counts..., +Inf count, sum]
+_histograms = {}
+
+
+def _labels(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _reset_after_fork():
+    """Forget the metrics a forked worker inherited from its parent."""
+    if _state['pid'] != os.getpid():
+        _counters.clear()
+        _histograms.clear()
+        _state['pid'] = os.getpid()
+        _state['flushed'] = time.monotonic()
+
+
+def increment(name, value=1, **labels):
+    if not settings.METRICS_ENABLED:
+        return
+    with _lock:
+        _reset_after_fork()
+        _counters[name, _labels(labels)] += value
+
+
+def observe(name, value, **labels):
+    if not settings.METRICS_ENABLED:
+        return
+    buckets = HISTOGRAM_BUCKETS[name]
+    with _lock:
+        _reset_after_fork()
+        key = name, _labels(labels)
+        if key not in _histograms:
+            _histograms[key] = [0] * (len(buckets) + 2)
+        histogram = _histograms[key]
+        histogram[bisect_left(buckets, value)] += 1
+        histogram[-1] += value
+
+
+# Metrics file of the stopped workers.
+ARCHIVE = 'archive'
+
+
+def metrics_path(pid):
+    return os.path.join(settings.METRICS_DIR, f'{pid}.json')
+
+
+def read_metrics(path):
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def write_metrics(path, data):
+    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+    os.replace(path + '.tmp', path)
+
+
+def flush(force=False):
+    """Write the metrics of this process to its file in ``METRICS_DIR``.
+
+    Unless forced, at most once per ``METRICS_FLUSH_INTERVAL`` seconds.
+    """
+    with _lock:
+        _reset_after_fork()
+        now = time.monotonic()
+        if not force and now - _state['flushed'] < (
+                settings.METRICS_FLUSH_INTERVAL):
+            return
+        _state['flushed'] = now
+        data = {
+            'pid': os.getpid(),
+            'updated': time.time(),
+            'counters': [
+                [name, dict(labels), value]
+                for (name, labels), value in _counters.items()
+            ],
+            'histograms': [
+                [name, dict(labels), values]
+                for (name, labels), values in _histograms.items()
+            ],
+            'pools': pool_stats(),
+        }
+    write_metrics(metrics_path(os.getpid()), data)
+
+
+def add_up(data, counters, histograms):
+    """Add the counters and histograms of a metrics file to the totals."""
+    for name, labels, value in data['counters']:
+        counters[name, _labels(labels)] += value
+    for name, labels, values in data['histograms']:
+        key = name, _labels(labels)
+        if key in histograms:
+            histograms[key] = [
+                total + value
+                for total, value in zip(histograms[key], values)
+            ]
+        else:
+            histograms[key] = values
+    for alias, stats in data['pools'].items():
+        for event in ('checkouts', 'waits', 'discarded'):
+            counters['yamdb_db_pool_events_total', _labels(
+                {'alias': alias, 'event': event})] += stats[event]
+
+
+def archive(pid):
+    """Fold the metrics file of a stopped worker into the archive.
+
+    Its counters and histograms stay in the totals, its gauges go away
+    with its file.
+    """
+    data = read_metrics(metrics_path(pid))
+    if data is None:
+        return
+    counters = defaultdict(float)
+    histograms = {}
+    archived = read_metrics(metrics_path(ARCHIVE))
+    if archived is not None:
+        add_up(archived, counters, histograms)
+    add_up(data, counters, histograms)
+    write_metrics(metrics_path(ARCHIVE), {
+        'pid': None,
+        'updated': time.time(),
+        'counters': [
+            [name, dict(labels), value]
+            for (name, labels), value in counters.items()
+        ],
+        'histograms': [
+            [name, dict(labels), values]
+            for (name, labels), values in histograms.items()
+        ],
+        'pools': {},
+    })
+    os.remove(metrics_path(pid))
+
+
+def collect():
+    """Sum up the metrics files of all worker processes.
+
+    Counters and histograms of the workers and of the archive are added
+    up; the pool and worker gauges of running workers keep a ``pid``
+    label.
+    """
+    counters = defaultdict(float)
+    histograms = {}
+    gauges = []
+    for path in sorted(glob.glob(os.path.join(
+            settings.METRICS_DIR, '*.json'))):
+        data = read_metrics(path)
+        if data is None:
+            continue
+        add_up(data, counters, histograms)
+        if data['pid'] is None:
+            continue
+        pid = str(data['pid'])
+        gauges.append((
+            'yamdb_worker_last_flush_timestamp_seconds', (('pid', pid),),
+            data['updated']))
+        for alias, stats in data['pools'].items():
+            for state in ('in_use', 'idle'):
+                gauges.append((
+                    'yamdb_db_pool_connections',
+                    _labels({'alias': alias, 'pid': pid, 'state': state}),
+                    stats[state]))
+    return counters, histograms, gauges
+
+
+def escape(value):
+    return (value.replace('\\', '\\\\').replace('\n', '\\n')
+            .replace('"', '\\"'))
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(f'{key}="{escape(value)}"' for key, value in labels)
+    return '{' + pairs + '}'
+
+
+def render():
+    """Return all workers' metrics in the Prometheus text format."""
+    counters, histograms, gauges = collect()
+    lines = []
+    described = set()
+
+    def describe(name, metric_type):
+        if name not in described:
+            described.add(name)
+            lines.append(f'# HELP {name} {HELP.get(name, name)}')
+            lines.append(f'# TYPE {name} {metric_type}')
+
+    for (name, labels), value in sorted(counters.items()):
+        describe(name, 'counter')
+        lines.append(f'{name}{format_labels(labels)} {value}')
+    for (name, labels), values in sorted(histograms.items()):
+        describe(name, 'histogram')
+        bounds = [*HISTOGRAM_BUCKETS[name], '+Inf']
+        cumulative = 0
+        for bound, count in zip(bounds, values):
+            cumulative += count
+            bucket_labels = format_labels((*labels, ('le', str(bound))))
+            lines.append(f'{name}_bucket{bucket_labels} {cumulative}')
+        lines.append(f'{name}_sum{format_labels(labels)} {values[-1]}')
+        lines.append(f'{name}_count{format_labels(labels)} {cumulative}')
+    for name, labels, value in sorted(gauges):
+        describe(name, 'gauge')
+        lines.append(f'{name}{format_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
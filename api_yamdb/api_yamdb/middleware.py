@@ -0,0 +1,248 @@
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from . import metrics
+from .db_routers import start_replica_reads, stop_replica_reads
+
+REPLICA_PIN_KEY = 'replica-pin:{}'
+SAFE_METHODS = ('GET', 'HEAD')
+REPEATED_SQL_LENGTH = 300
+
+logger = logging.getLogger('api_yamdb.timing')
+_local = threading.local()
+
+
+def replica_pin_key(request):
+    """Identify the client by its credentials, None for anonymous ones."""
+    credentials = request.META.get('HTTP_AUTHORIZATION') or (
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME))
+    if not credentials:
+        return None
+    return REPLICA_PIN_KEY.format(
+        hashlib.md5(credentials.encode()).hexdigest())
+
+
+class ReplicaMiddleware:
+    """Serve safe requests from the read replicas.
+
+    A client that has written something reads from the primary for the
+    next ``REPLICA_PIN_SECONDS``, so it sees its own changes even when
+    the replicas are behind.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.REPLICA_DATABASES:
+            return self.get_response(request)
+        pin_key = replica_pin_key(request)
+        if request.method in SAFE_METHODS and not (
+                pin_key and cache.get(pin_key)):
+            start_replica_reads()
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = stop_replica_reads()
+        if wrote and pin_key:
+            cache.set(pin_key, True, timeout=settings.REPLICA_PIN_SECONDS)
+        return response
+
+
+class RequestTimings:
+    """Timings of one request, also the execute wrapper of its queries."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view = None
+        self.queries = 0
+        self.durations = defaultdict(float)
+        self.depth = defaultdict(int)
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.durations['db'] += time.perf_counter() - start
+            self.queries += 1
+            self.shapes[sql] += 1
+
+    def add(self, name, start):
+        self.durations[name] += time.perf_counter() - start
+
+    def repeated_queries(self):
+        """Return the SQL run often enough in the request to be an N+1."""
+        return [
+            {'sql': sql[:REPEATED_SQL_LENGTH], 'count': count}
+            for sql, count in self.shapes.most_common()
+            if count >= settings.REQUEST_TIMING_REPEATED_QUERIES
+        ]
+
+    def header(self):
+        parts = [f'db;dur={self.durations["db"] * 1000:.1f};'
+                 f'desc="{self.queries} queries"']
+        parts += [
+            f'{name};dur={self.durations[name] * 1000:.1f}'
+            for name in ('serialize', 'render') if name in self.durations
+        ]
+        parts.append(f'total;dur={self.durations["total"] * 1000:.1f}')
+        return ', '.join(parts)
+
+    def as_dict(self):
+        return {
+            'view': self.view,
+            'queries': self.queries,
+            **{
+                f'{name}_ms': round(duration * 1000, 3)
+                for name, duration in self.durations.items()
+            },
+        }
+
+
+def current_timings():
+    return getattr(_local, 'timings', None)
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request timings.
+
+    Nested blocks of the same name, such as nested serializers, are
+    counted once.
+    """
+    timings = current_timings()
+    if timings is None or timings.depth[name]:
+        yield
+        return
+    timings.depth[name] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, start)
+        timings.depth[name] -= 1
+
+
+def view_name(request, view_func):
+    """Name a viewset action like ``TitlesViewSet.list``, any other view
+    by its URL name."""
+    actions = getattr(view_func, 'actions', None)
+    if actions:
+        action = actions.get(request.method.lower(), 'metadata')
+        return f'{view_func.cls.__name__}.{action}'
+    if hasattr(view_func, 'cls'):
+        return view_func.cls.__name__
+    return request.resolver_match.view_name
+
+
+class RequestTimingMiddleware:
+    """Time the queries, serializers and rendering of sampled requests.
+
+    The timings go to the ``Server-Timing`` header and, as a JSON line,
+    to the ``api_yamdb.timing`` logger. The same SQL run at least
+    ``REQUEST_TIMING_REPEATED_QUERIES`` times in a request is logged as
+    a warning, it usually is an N+1 query. With metrics on, every request
+    is timed for ``MetricsMiddleware``, but only sampled ones are
+    reported.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sampled = settings.REQUEST_TIMING_ENABLED and (
+            random.random() < settings.REQUEST_TIMING_SAMPLE_RATE)
+        if not sampled and not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        timings = request.timings = _local.timings = RequestTimings()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(
+                        connections[alias].execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            _local.timings = None
+        timings.add('total', timings.started)
+        if sampled:
+            self.report(request, response, timings)
+        return response
+
+    def report(self, request, response, timings):
+        if settings.REQUEST_TIMING_HEADER:
+            response['Server-Timing'] = timings.header()
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            **timings.as_dict(),
+        }
+        repeated = timings.repeated_queries()
+        if repeated:
+            record['repeated_queries'] = repeated
+            logger.warning(json.dumps(record, ensure_ascii=False))
+        else:
+            logger.info(json.dumps(record, ensure_ascii=False))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = current_timings()
+        if timings is not None:
+            timings.view = view_name(request, view_func)
+
+    def process_template_response(self, request, response):
+        timings = current_timings()
+        if timings is not None:
+            start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda response: timings.add('render', start))
+        return response
+
+
+class MetricsMiddleware:
+    """Count requests, their latency, size and queries per route name.
+
+    The route is the URL name, such as ``titles-list``, so that the
+    number of series does not grow with the ids in the paths.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        resolver_match = getattr(request, 'resolver_match', None)
+        route = resolver_match.view_name if resolver_match else 'unmatched'
+        metrics.increment(
+            'yamdb_requests_total', route=route, method=request.method,
+            status=response.status_code)
+        metrics.observe(
+            'yamdb_request_duration_seconds', time.perf_counter() - start,
+            route=route)
+        if not response.streaming:
+            metrics.observe(
+                'yamdb_response_size_bytes', len(response.content),
+                route=route)
+        timings = getattr(request, 'timings', None)
+        if timings is not None:
+            metrics.observe(
+                'yamdb_request_db_queries', timings.queries, route=route)
+            metrics.observe(
+                'yamdb_request_db_duration_seconds',
+                timings.durations['db'], route=route)
+        metrics.flush()
+        return response
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
@@ -25,13 +26,16 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
     'django_filters',
-    'api',
-    'reviews',
+    'api.apps.ApiConfig',
+    'reviews.apps.ReviewConfig',
     'users',
 ]
 
 MIDDLEWARE = [
+    'api_yamdb.middleware.MetricsMiddleware',
+    'api_yamdb.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api_yamdb.middleware.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -61,8 +65,20 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+# Threads running the catalogue list requests in the ASGI mode, per worker.
+ASGI_READ_THREADS = int(os.getenv('ASGI_READ_THREADS', default=8))
+
 
 # Database
+# DB_CONN_MAX_AGE keeps a connection open for that many seconds per
+# thread, 0 closes it after every request. DB_ENGINE set to
+# api_yamdb.db_backends.postgresql_pool borrows the connections from a
+# pool per worker process instead and returns them after every request,
+# whatever DB_CONN_MAX_AGE says: DB_POOL_MIN_SIZE idle connections are
+# kept, at most DB_POOL_MAX_SIZE are in use (gunicorn refuses to start
+# with more threads, or ASGI_READ_THREADS, per worker), a checkout waits
+# DB_POOL_TIMEOUT seconds and connections idle longer than
+# DB_POOL_CHECK_INTERVAL seconds are pinged before use.
 
 DATABASES = {
     'default': {
@@ -71,10 +87,103 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', default='postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='postgres'),
         'HOST': os.getenv('DB_HOST', default='db'),
-        'PORT': os.getenv('DB_PORT', default='5432')
+        'PORT': os.getenv('DB_PORT', default='5432'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=60)),
+        'POOL': {
+            'MIN_SIZE': int(os.getenv('DB_POOL_MIN_SIZE', default=1)),
+            'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', default=10)),
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', default=10)),
+            'CHECK_INTERVAL': float(os.getenv('DB_POOL_CHECK_INTERVAL', default=30)),
+        },
+    }
+}
+
+# Read replicas: DB_REPLICA_HOSTS is a comma separated list of host or
+# host:port items sharing the credentials of the primary. Safe requests
+# read from a replica that lags at most REPLICA_MAX_LAG seconds, checked
+# every REPLICA_CHECK_INTERVAL seconds; a client that wrote something
+# reads from the primary for REPLICA_PIN_SECONDS.
+
+REPLICA_DATABASES = []
+for index, replica in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', default='').split(','))):
+    host, _, port = replica.strip().partition(':')
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ['api_yamdb.db_routers.ReplicaRouter']
+
+REPLICA_MAX_LAG = float(os.getenv('REPLICA_MAX_LAG', default=5))
+REPLICA_CHECK_INTERVAL = float(os.getenv('REPLICA_CHECK_INTERVAL', default=10))
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', default=15))
+
+
+# Cache
+# CACHE_BACKEND picks where API responses are cached:
+# django.core.cache.backends.locmem.LocMemCache keeps them per process,
+# django.core.cache.backends.filebased.FileBasedCache shares them between
+# the workers of a host (CACHE_LOCATION is a directory) and
+# django_redis.cache.RedisCache (requires django-redis) shares them between
+# hosts (CACHE_LOCATION is a redis:// URL). The cache also holds the version
+# counters behind ETags, so several server processes need a shared backend;
+# gunicorn refuses to start more than one worker with LocMemCache.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='yamdb'),
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', default=300)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', default=1000)),
+        },
     }
 }
 
+API_CACHE_ENABLED = os.getenv('API_CACHE_ENABLED', default='True') == 'True'
+
+
+# Request timing
+# REQUEST_TIMING_SAMPLE_RATE of the requests get a JSON line in the
+# api_yamdb.timing log and, if REQUEST_TIMING_HEADER is True, a
+# Server-Timing header; the same SQL run REQUEST_TIMING_REPEATED_QUERIES
+# times in one request is logged as a warning. The header shows anyone
+# the SQL time of the request, so it is off unless turned on for
+# development or debugging.
+
+REQUEST_TIMING_ENABLED = os.getenv('REQUEST_TIMING_ENABLED', default='True') == 'True'
+REQUEST_TIMING_SAMPLE_RATE = float(os.getenv('REQUEST_TIMING_SAMPLE_RATE', default=0.01))
+REQUEST_TIMING_HEADER = os.getenv('REQUEST_TIMING_HEADER', default='False') == 'True'
+REQUEST_TIMING_REPEATED_QUERIES = int(os.getenv('REQUEST_TIMING_REPEATED_QUERIES', default=5))
+
+# Metrics
+# Every worker process writes its metrics to METRICS_DIR at most every
+# METRICS_FLUSH_INTERVAL seconds; /metrics adds up the files of all the
+# workers, so the directory must be shared by them and emptied when the
+# server starts.
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', default='True') == 'True'
+METRICS_DIR = os.getenv('METRICS_DIR', default=os.path.join(tempfile.gettempdir(), 'yamdb-metrics'))
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', default=5))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api_yamdb.timing': {
+            'handlers': ['console'],
+            'level': os.getenv('REQUEST_TIMING_LOG_LEVEL', default='INFO'),
+        },
+    },
+}
+
 
 # Password validation
 
@@ -123,11 +232,13 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.'
                                 'PageNumberPagination',
-    'PAGE_SIZE': 5,
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', default=5)),
+    # nginx sets X-Forwarded-For to the client address.
+    'NUM_PROXIES': int(os.getenv('API_NUM_PROXIES', default=1)),
 }
 
 SIMPLE_JWT = {
@@ -135,6 +246,18 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Wrong confirmation codes per client address and username, and per
+# client address in all, within TOKEN_FAILED_ATTEMPTS_WINDOW seconds; the
+# counters live in the cache, see CACHE_BACKEND.
+TOKEN_MAX_FAILED_ATTEMPTS = int(os.getenv('TOKEN_MAX_FAILED_ATTEMPTS', default=5))
+TOKEN_MAX_CLIENT_FAILED_ATTEMPTS = int(os.getenv('TOKEN_MAX_CLIENT_FAILED_ATTEMPTS', default=50))
+TOKEN_FAILED_ATTEMPTS_WINDOW = int(os.getenv('TOKEN_FAILED_ATTEMPTS_WINDOW', default=300))
+
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', default=1000))
+
+JWT_USER_CACHE_TTL = int(os.getenv('JWT_USER_CACHE_TTL', default=30))
+JWT_USER_CACHE_SIZE = int(os.getenv('JWT_USER_CACHE_SIZE', default=10000))
+
 AUTH_USER_MODEL = 'users.User'
 
 ME = 'me'
@@ -148,5 +271,10 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 EMAIL_PORT = os.getenv('EMAIL_PORT')
 
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv('EMAIL_OUTBOX_RETRY_DELAY', default=60))
+
 MIN_SCORE = 0
 MAX_SCORE = 10
+
+SEARCH_CONFIG = 'russian'
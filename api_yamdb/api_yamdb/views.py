@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from . import metrics as worker_metrics
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def metrics(request):
+    """Prometheus metrics of all the worker processes.
+
+    Not under /api/: nginx does not pass it through, scrape the web
+    container directly.
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    worker_metrics.flush(force=True)
+    return HttpResponse(worker_metrics.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,130 @@
+"""Gunicorn settings, all of them overridable with GUNICORN_* variables.
+
+The worker class is gthread by default: I/O waits of a request (the
+database, the cache, slow clients) leave the other threads of the
+worker running. gevent needs the gevent and psycogreen packages;
+uvicorn.workers.UvicornWorker serves api_yamdb.asgi:application, set
+GUNICORN_APP to it.
+
+Mind the database: every thread may hold a connection, so workers times
+threads must stay below the connection limit of PostgreSQL, and
+DB_POOL_MAX_SIZE should be at least the number of threads.
+
+Mind the cache too: it holds the ETag versions, the replica pins and the
+confirmation code throttle, so several workers need a shared
+CACHE_BACKEND. Without one gunicorn runs a single worker by default and
+refuses to start more.
+"""
+import glob
+import os
+
+
+def env_int(name, default):
+    return int(os.getenv(name, default=default))
+
+
+def cpu_count():
+    """CPUs this process may run on, fewer than the host has in a
+    container pinned to some of them."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+LOCMEM_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+def shared_cache():
+    """Whether the workers would share the cache of the settings."""
+    return os.getenv('CACHE_BACKEND', default=LOCMEM_CACHE) != LOCMEM_CACHE
+
+
+bind = os.getenv('GUNICORN_BIND', default='0.0.0.0:8000')
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', default='gthread')
+workers = env_int(
+    'GUNICORN_WORKERS',
+    min(cpu_count() * 2 + 1, env_int('GUNICORN_MAX_WORKERS', 12))
+    if shared_cache() else 1)
+threads = env_int(
+    'GUNICORN_THREADS', 4 if worker_class == 'gthread' else 1)
+worker_connections = env_int('GUNICORN_WORKER_CONNECTIONS', 1000)
+
+# Restart workers now and then to bound slow memory growth; the jitter
+# keeps them from restarting all at once.
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 2000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 200)
+
+timeout = env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+
+# Load Django in the master, so the workers share its memory pages.
+preload_app = os.getenv('GUNICORN_PRELOAD', default='True') == 'True'
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', default='-') or None
+
+
+def warmup():
+    """Build what Django and DRF build lazily on the first requests."""
+    from api import serializers
+    from django.db import connections
+    from django.urls import resolve, reverse
+    from rest_framework.serializers import BaseSerializer, ListSerializer
+
+    reverse('titles-list')
+    resolve('/api/v1/titles/1/reviews/1/comments/')
+    for serializer_class in vars(serializers).values():
+        if isinstance(serializer_class, type) and issubclass(
+                serializer_class, BaseSerializer) and not issubclass(
+                serializer_class, ListSerializer):
+            serializer_class().fields
+    # Connections must not be shared with the forked workers.
+    connections.close_all()
+
+
+def on_starting(server):
+    """Check the cache and the database pools fit the workers and drop
+    the metrics files of the workers of a previous run."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    from api.cache import check_shared_cache
+    from django.conf import settings
+    from django.core.exceptions import ImproperlyConfigured
+
+    from api_yamdb.db_backends.postgresql_pool.pool import check_pool_size
+
+    try:
+        check_shared_cache(server.num_workers)
+        check_pool_size(settings.DATABASES, (
+            settings.ASGI_READ_THREADS if worker_class.startswith('uvicorn')
+            else server.cfg.threads))
+    except ImproperlyConfigured as error:
+        # gunicorn prints a RuntimeError and exits.
+        raise RuntimeError(str(error))
+
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, '*.json')):
+        os.remove(path)
+
+
+def when_ready(server):
+    if preload_app:
+        warmup()
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        warmup()
+
+
+def child_exit(server, worker):
+    """Keep the counters of a stopped worker but not its gauges."""
+    from api_yamdb.metrics import archive
+
+    archive(worker.pid)
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
@@ -0,0 +1,62 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment, Review, Title
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+EXPORT_FIELDS = (
+    'type', 'id', 'title_id', 'review_id', 'name', 'year', 'category',
+    'description', 'text', 'author', 'score', 'pub_date',
+)
+
+
+def export_rows(chunk_size=2000):
+    """Yield all titles, then reviews, then comments as flat dicts.
+
+    Every queryset is read with ``iterator()``, a server-side cursor on
+    PostgreSQL, so memory does not grow with the size of the tables.
+    """
+    titles = Title.objects.order_by('pk').values(
+        'id', 'name', 'year', 'description', 'category__slug')
+    for title in titles.iterator(chunk_size=chunk_size):
+        title['category'] = title.pop('category__slug')
+        yield {'type': 'title', **title}
+    reviews = Review.objects.order_by('pk').values(
+        'id', 'title_id', 'text', 'author__username', 'score', 'pub_date')
+    for review in reviews.iterator(chunk_size=chunk_size):
+        review['author'] = review.pop('author__username')
+        yield {'type': 'review', **review}
+    comments = Comment.objects.order_by('pk').values(
+        'id', 'review__title_id', 'review_id', 'text', 'author__username',
+        'pub_date')
+    for comment in comments.iterator(chunk_size=chunk_size):
+        comment['title_id'] = comment.pop('review__title_id')
+        comment['author'] = comment.pop('author__username')
+        yield {'type': 'comment', **comment}
+
+
+class EchoBuffer:
+    """File-like object that hands back what is written to it."""
+
+    def write(self, value):
+        return value
+
+
+def render_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+        yield '\n'
+
+
+def render_csv(rows):
+    writer = csv.DictWriter(EchoBuffer(), fieldnames=EXPORT_FIELDS)
+    yield writer.writerow(dict(zip(EXPORT_FIELDS, EXPORT_FIELDS)))
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def render_export(export_format, chunk_size=2000):
+    render = render_csv if export_format == 'csv' else render_ndjson
+    return render(export_rows(chunk_size=chunk_size))
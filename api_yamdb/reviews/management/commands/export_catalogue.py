@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from reviews.export import EXPORT_FORMATS, render_export
+
+
+class Command(BaseCommand):
+    help = 'Export titles with their reviews and comments as NDJSON or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', choices=EXPORT_FORMATS, default='ndjson',
+            help='Output format, ndjson (default) or csv.')
+        parser.add_argument(
+            '--output', help='Output file, standard output by default.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Rows fetched from the database cursor at a time.')
+
+    def handle(self, *args, **options):
+        chunks = render_export(options['format'], options['chunk_size'])
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as file:
+            file.writelines(chunks)
@@ -0,0 +1,240 @@
+import csv
+import json
+import os
+from contextlib import contextmanager
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.signals import bulk_changed
+from users.models import User
+
+FORMATS = {'csv': '.csv', 'jsonl': '.jsonl'}
+
+
+def optional_int(value):
+    if value in (None, ''):
+        return None
+    return int(value)
+
+
+def parse_date(value):
+    return parse_datetime(value) if value else timezone.now()
+
+
+class KeyMap:
+    """Resolve natural keys (slugs, usernames) to ids, loaded on first use.
+
+    Numeric values that are not known keys are taken as ids.
+    """
+
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+        self.ids = None
+
+    def resolve(self, value):
+        if value in (None, ''):
+            return None
+        if self.ids is None:
+            self.ids = dict(self.model.objects.values_list(self.field, 'id'))
+        value = str(value)
+        if value in self.ids:
+            return self.ids[value]
+        if value.isdigit():
+            return int(value)
+        raise CommandError(
+            f'Unknown {self.model._meta.model_name} {self.field}: {value}')
+
+
+class Command(BaseCommand):
+    help = (
+        'Import categories, genres, titles, genre_title, users, reviews '
+        'and comments from <entity>.csv or <entity>.jsonl files in a '
+        'directory, in batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Directory with the data files.')
+        parser.add_argument(
+            '--format', choices=FORMATS, default='csv',
+            help='Data file format, csv (default) or JSON Lines.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows written per INSERT and transaction.')
+        parser.add_argument(
+            '--state-file',
+            help='Progress file, <path>/.import_state.json by default.')
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Skip the rows imported by a previous, interrupted run.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        self.categories = KeyMap(Category, 'slug')
+        self.genres = KeyMap(Genre, 'slug')
+        self.users = KeyMap(User, 'username')
+        entities = (
+            ('categories', Category, self.build_category),
+            ('genres', Genre, self.build_genre),
+            ('titles', Title, self.build_title),
+            ('genre_title', GenreTitle, self.build_genre_title),
+            ('users', User, self.build_user),
+            ('reviews', Review, self.build_review),
+            ('comments', Comment, self.build_comment),
+        )
+        state_file = options['state_file'] or os.path.join(
+            options['path'], '.import_state.json')
+        state = self.load_state(state_file) if options['resume'] else {}
+        imported = []
+        with self.keep_publication_dates():
+            for name, model, build in entities:
+                path = os.path.join(
+                    options['path'], name + FORMATS[options['format']])
+                if not os.path.exists(path):
+                    continue
+                rows = self.read_rows(path, options['format'])
+                done = self.import_rows(
+                    name, model, build, rows, state, state_file,
+                    options['batch_size'])
+                imported.append(model)
+                self.stdout.write(f'{name}: {done} rows')
+        self.finish(imported)
+        if os.path.exists(state_file):
+            os.remove(state_file)
+        self.stdout.write(self.style.SUCCESS('Import finished.'))
+
+    def import_rows(self, name, model, build, rows, state, state_file,
+                    batch_size):
+        done = state.get(name, 0)
+        rows = islice(rows, done, None)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return done
+            objs = [build(row) for row in batch]
+            try:
+                with transaction.atomic():
+                    model.objects.bulk_create(
+                        objs, batch_size=batch_size, ignore_conflicts=True)
+            except DatabaseError as error:
+                raise CommandError(
+                    f'{name}: batch after row {done} failed: {error}. '
+                    'Fix the data and rerun with --resume.')
+            done += len(batch)
+            state[name] = done
+            self.save_state(state_file, state)
+
+    def finish(self, imported):
+        """Redo what bulk_create skipped: signals, ratings and sequences."""
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                    no_style(), imported):
+                cursor.execute(sql)
+        if Title in imported or Review in imported:
+            Title.objects.rebuild_ratings()
+        if Title in imported:
+            Title.objects.filter(
+                search_vector__isnull=True).update_search_vector()
+        bulk_changed.send(sender=self.__class__, models=imported)
+
+    @staticmethod
+    def read_rows(path, data_format):
+        with open(path, encoding='utf-8', newline='') as file:
+            if data_format == 'csv':
+                yield from csv.DictReader(file)
+            else:
+                for line in file:
+                    if line.strip():
+                        yield json.loads(line)
+
+    @staticmethod
+    def load_state(state_file):
+        if not os.path.exists(state_file):
+            return {}
+        with open(state_file, encoding='utf-8') as file:
+            return json.load(file)
+
+    @staticmethod
+    def save_state(state_file, state):
+        with open(state_file, 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+
+    @staticmethod
+    @contextmanager
+    def keep_publication_dates():
+        """Let bulk_create keep the imported pub_date values."""
+        fields = [model._meta.get_field('pub_date')
+                  for model in (Review, Comment)]
+        for field in fields:
+            field.auto_now_add = False
+        try:
+            yield
+        finally:
+            for field in fields:
+                field.auto_now_add = True
+
+    @staticmethod
+    def build_category(row):
+        return Category(
+            id=optional_int(row.get('id')),
+            name=row['name'],
+            slug=row['slug'])
+
+    @staticmethod
+    def build_genre(row):
+        return Genre(
+            id=optional_int(row.get('id')),
+            name=row['name'],
+            slug=row['slug'])
+
+    def build_title(self, row):
+        return Title(
+            id=optional_int(row.get('id')),
+            name=row['name'],
+            year=int(row['year']),
+            description=row.get('description') or '',
+            category_id=self.categories.resolve(row.get('category')))
+
+    def build_genre_title(self, row):
+        return GenreTitle(
+            id=optional_int(row.get('id')),
+            title_id=int(row.get('title_id') or row['title']),
+            genre_id=self.genres.resolve(
+                row.get('genre_id') or row.get('genre')))
+
+    @staticmethod
+    def build_user(row):
+        user = User(
+            id=optional_int(row.get('id')),
+            username=row['username'],
+            email=row['email'],
+            role=row.get('role') or User.USER,
+            bio=row.get('bio') or '',
+            first_name=row.get('first_name') or '',
+            last_name=row.get('last_name') or '')
+        user.set_status()
+        user.set_unusable_password()
+        return user
+
+    def build_review(self, row):
+        return Review(
+            id=optional_int(row.get('id')),
+            title_id=int(row.get('title_id') or row['title']),
+            text=row['text'],
+            author_id=self.users.resolve(row['author']),
+            score=optional_int(row.get('score')),
+            pub_date=parse_date(row.get('pub_date')))
+
+    def build_comment(self, row):
+        return Comment(
+            id=optional_int(row.get('id')),
+            review_id=int(row.get('review_id') or row['review']),
+            text=row['text'],
+            author_id=self.users.resolve(row['author']),
+            pub_date=parse_date(row.get('pub_date')))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'Recalculate the stored rating of every title from its reviews.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = Title.objects.rebuild_ratings()
+        self.stdout.write(self.style.SUCCESS(f'Updated titles: {updated}'))
@@ -1,7 +1,11 @@
 from datetime import datetime
 
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (Avg, Count, ExpressionWrapper, F, FloatField,
+                              OuterRef, Subquery, Sum)
+from django.db.models.functions import Cast, Coalesce, NullIf
 from users.models import User
 
 from api_yamdb.settings import MAX_SCORE, MIN_SCORE
@@ -11,6 +15,13 @@ def get_year():
     return datetime.now().year
 
 
+def score_delta(score):
+    """Return the (sum, count) contribution of a single review score."""
+    if score is None:
+        return 0, 0
+    return score, 1
+
+
 class Category(models.Model):
     name = models.CharField(
         verbose_name='Название категории',
@@ -55,6 +66,48 @@ class Genre(models.Model):
         return self.slug
 
 
+class TitleQuerySet(models.QuerySet):
+    def update_search_vector(self):
+        """Refresh the full-text search vector, on PostgreSQL only."""
+        from .search import is_postgresql, title_search_vector
+
+        if not is_postgresql(self.db):
+            return 0
+        return self.update(search_vector=title_search_vector())
+
+    def shift_rating(self, score_sum, score_count):
+        """Shift the stored rating aggregates by the given deltas."""
+        new_sum = F('rating_sum') + score_sum
+        new_count = F('rating_count') + score_count
+        return self.update(
+            rating_sum=new_sum,
+            rating_count=new_count,
+            rating=ExpressionWrapper(
+                Cast(new_sum, FloatField()) / NullIf(new_count, 0),
+                output_field=FloatField()
+            )
+        )
+
+    def rebuild_ratings(self):
+        """Recalculate the stored rating aggregates from the reviews."""
+        scores = Review.objects.filter(
+            title=OuterRef('pk'), score__isnull=False
+        ).order_by().values('title')
+        return self.update(
+            rating_sum=Coalesce(
+                Subquery(scores.annotate(value=Sum('score')).values('value')),
+                0
+            ),
+            rating_count=Coalesce(
+                Subquery(
+                    scores.annotate(value=Count('score')).values('value')),
+                0
+            ),
+            rating=Subquery(
+                scores.annotate(value=Avg('score')).values('value'))
+        )
+
+
 class Title(models.Model):
     name = models.TextField(verbose_name='Название')
     year = models.PositiveSmallIntegerField(
@@ -83,9 +136,47 @@ class Title(models.Model):
         verbose_name='Категория',
         help_text='Категория'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок',
+        help_text='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок',
+        help_text='Количество оценок'
+    )
+    rating = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name='Рейтинг',
+        help_text='Рейтинг'
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name='Поисковый вектор',
+        help_text='Поисковый вектор'
+    )
+
+    objects = TitleQuerySet.as_manager()
+
+    # Only reviews change the rating, through TitleQuerySet.shift_rating,
+    # and update_title_search_vector keeps the search vector.
+    computed_fields = ('rating_sum', 'rating_count', 'rating', 'search_vector')
 
     class Meta:
-        ordering = ('name',)
+        ordering = ('name', 'id')
+        indexes = (
+            models.Index(fields=('name', 'id'), name='title_name_idx'),
+            models.Index(fields=('year', 'name'), name='title_year_name_idx'),
+            models.Index(
+                fields=('category', 'name'), name='title_category_name_idx'),
+        )
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
 
@@ -95,6 +186,23 @@ class Title(models.Model):
             f'year: {self.year}, '
         )
 
+    def save(self, force_insert=False, force_update=False, using=None,
+             update_fields=None):
+        """Save the title, leaving out the computed and deferred fields on
+        updates.
+
+        The rating of an instance loaded before a review was written is
+        stale, and saving it would undo the review; a deferred field
+        would be loaded just to be written back.
+        """
+        if not self._state.adding and update_fields is None:
+            skipped = {*self.computed_fields, *self.get_deferred_fields()}
+            update_fields = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped
+            ]
+        super().save(force_insert, force_update, using, update_fields)
+
 
 class GenreTitle(models.Model):
     genre = models.ForeignKey(
@@ -112,6 +220,17 @@ class GenreTitle(models.Model):
         help_text='Название'
     )
 
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'genre'),
+                name='unique_title_genre'
+            ),
+        )
+        indexes = (
+            models.Index(fields=('genre', 'title'), name='genre_title_idx'),
+        )
+
     def __str__(self):
         return f'{self.genre}  ---  {self.title}'
 
@@ -148,14 +267,55 @@ class Review(models.Model):
     def __str__(self) -> str:
         return self.text[:15]
 
+    def stored_rating(self):
+        """Lock the saved review and return its title id and score.
+
+        Call it in a transaction: the row lock keeps a concurrent save or
+        delete from changing the score until this one is done with it.
+        """
+        return Review.objects.select_for_update().filter(
+            pk=self.pk).values_list('title_id', 'score').first() or (
+            None, None)
+
+    def save(self, *args, **kwargs):
+        """Save the review and keep the title rating in step with it."""
+        with transaction.atomic():
+            if self._state.adding:
+                old_title_id, old_score = None, None
+            else:
+                old_title_id, old_score = self.stored_rating()
+            super().save(*args, **kwargs)
+            old_sum, old_count = score_delta(old_score)
+            new_sum, new_count = score_delta(self.score)
+            if old_title_id == self.title_id:
+                if (old_sum, old_count) != (new_sum, new_count):
+                    Title.objects.filter(pk=self.title_id).shift_rating(
+                        new_sum - old_sum, new_count - old_count)
+            else:
+                if old_title_id is not None:
+                    Title.objects.filter(pk=old_title_id).shift_rating(
+                        -old_sum, -old_count)
+                # The rating update doubles as the check that the title
+                # exists: the foreign key is only checked on commit.
+                if not Title.objects.filter(pk=self.title_id).shift_rating(
+                        new_sum, new_count):
+                    raise Title.DoesNotExist(
+                        f'Title {self.title_id} does not exist.')
+
     class Meta:
-        ordering = ('pub_date',)
+        ordering = ('pub_date', 'id')
         constraints = (
             models.UniqueConstraint(
                 fields=['title', 'author'],
                 name='unique_title_author'
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
 
@@ -187,7 +347,13 @@ class Comment(models.Model):
     )
 
     class Meta:
-        ordering = ('pub_date',)
+        ordering = ('pub_date', 'id')
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
 
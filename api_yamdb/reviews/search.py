@@ -0,0 +1,67 @@
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVector)
+from django.db import connections
+from django.db.models import Case, F, IntegerField, Q, Value, When
+
+from api_yamdb.settings import SEARCH_CONFIG
+
+SEARCH_INDEX_NAME = 'reviews_title_search_idx'
+
+
+def is_postgresql(using):
+    return connections[using].vendor == 'postgresql'
+
+
+def title_search_vector():
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def create_search_index(using, **kwargs):
+    """Create the GIN index over titles and fill missing search vectors.
+
+    Connected to ``post_migrate``; other backends search without an index.
+    """
+    if not is_postgresql(using):
+        return
+    from .models import Title
+
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS {SEARCH_INDEX_NAME} '
+            f'ON {Title._meta.db_table} USING gin (search_vector)'
+        )
+    Title.objects.using(using).filter(
+        search_vector__isnull=True).update_search_vector()
+
+
+def search_titles(queryset, value):
+    """Filter titles by name and description, best matches first.
+
+    PostgreSQL ranks the stored search vector; other backends require
+    every word to occur in the name or the description and rank name
+    matches higher. SQLite compares non-ASCII letters case-sensitively.
+    """
+    if is_postgresql(queryset.db):
+        query = SearchQuery(value, config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query)
+        ).order_by('-rank', 'name')
+    words = value.split()
+    if not words:
+        return queryset
+    matches = Q()
+    ranks = Value(0)
+    for word in words:
+        matches &= Q(name__icontains=word) | Q(description__icontains=word)
+        ranks += Case(
+            When(name__icontains=word, then=Value(2)),
+            When(description__icontains=word, then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField()
+        )
+    return queryset.filter(matches).annotate(
+        rank=ranks
+    ).order_by('-rank', 'name')
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from .models import Review, Title, score_delta
+
+# Sent after bulk writes that bypass the per-object model signals.
+bulk_changed = Signal(providing_args=['models'])
+
+
+@receiver(pre_delete, sender=Review)
+def remove_review_score(sender, instance, **kwargs):
+    """Take a deleted review out of its title rating.
+
+    Deletion goes through a signal rather than ``Review.delete`` so that
+    cascades from titles and users and queryset deletes are covered too.
+    The score is the one stored, locked until the row is deleted in the
+    same transaction: the instance may be stale, and a review deleted
+    meanwhile has no score left to take out.
+    """
+    title_id, score = instance.stored_rating()
+    score_sum, score_count = score_delta(score)
+    if score_count:
+        Title.objects.filter(pk=title_id).shift_rating(
+            -score_sum, -score_count)
+
+
+@receiver(post_save, sender=Title)
+def update_title_search_vector(sender, instance, update_fields, **kwargs):
+    if update_fields and not {'name', 'description'} & set(update_fields):
+        return
+    Title.objects.filter(pk=instance.pk).update_search_vector()
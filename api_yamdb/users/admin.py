@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import User
+from .models import OutgoingEmail, User
 
 
 class CustomUserAdmin(UserAdmin):
@@ -16,4 +16,13 @@ class CustomUserAdmin(UserAdmin):
     empty_value_display = '-пусто-'
 
 
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient', 'subject', 'created', 'attempts', 'next_attempt', 'sent')
+    search_fields = ('recipient',)
+    list_filter = ('sent',)
+    empty_value_display = '-пусто-'
+
+
 admin.site.register(User, CustomUserAdmin)
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
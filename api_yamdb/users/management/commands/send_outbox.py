@@ -0,0 +1,85 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from users.models import OutgoingEmail
+
+
+class Command(BaseCommand):
+    help = (
+        'Send queued emails in batches over one SMTP connection per batch, '
+        'retrying failures with exponential backoff.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=50,
+            help='Emails sent per connection and transaction.')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to wait when the outbox is empty.')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Send one batch and exit instead of polling.')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = self.send_batch(options['batch_size'])
+            if options['once']:
+                return
+            if not processed:
+                time.sleep(options['interval'])
+
+    def send_batch(self, batch_size):
+        """Send up to ``batch_size`` due emails, return how many were tried.
+
+        The rows stay locked until the batch is recorded, and other workers
+        skip them, so several workers can drain the outbox together.
+        """
+        with transaction.atomic():
+            emails = list(
+                OutgoingEmail.objects.pending(
+                    settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+                ).select_for_update(skip_locked=True)[:batch_size]
+            )
+            if not emails:
+                return 0
+            try:
+                connection = get_connection()
+                connection.open()
+            except Exception as error:
+                for email in emails:
+                    self.postpone(email, error)
+            else:
+                try:
+                    for email in emails:
+                        self.send(email, connection)
+                finally:
+                    connection.close()
+            OutgoingEmail.objects.bulk_update(
+                emails, ('attempts', 'next_attempt', 'sent', 'last_error'))
+        return len(emails)
+
+    def send(self, email, connection):
+        message = EmailMessage(
+            email.subject, email.message, email.from_email or None,
+            [email.recipient], connection=connection)
+        try:
+            message.send()
+        except Exception as error:
+            self.postpone(email, error)
+        else:
+            email.sent = timezone.now()
+            email.last_error = ''
+
+    def postpone(self, email, error):
+        email.attempts += 1
+        email.last_error = str(error)
+        email.next_attempt = timezone.now() + timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETRY_DELAY
+            * 2 ** (email.attempts - 1))
+        self.stderr.write(f'{email}: {error}')
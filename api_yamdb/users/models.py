@@ -1,7 +1,6 @@
 from django.contrib.auth.models import (AbstractBaseUser, PermissionsMixin,
                                         UserManager)
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.db import models
 from django.utils import timezone
 
@@ -133,9 +132,50 @@ class User(AbstractBaseUser, PermissionsMixin):
         """Return the short name for the user."""
         return self.first_name
 
-    def email_user(self, subject, message, from_email=None, **kwargs):
-        """Send an email to this user."""
-        send_mail(subject, message, from_email, [self.email], **kwargs)
+    def email_user(self, subject, message, from_email=None):
+        """Queue an email to this user, see ``OutgoingEmail``."""
+        OutgoingEmail.objects.create(
+            subject=subject,
+            message=message,
+            from_email=from_email or '',
+            recipient=self.email
+        )
 
     def __str__(self):
         return self.username
+
+
+class OutgoingEmailQuerySet(models.QuerySet):
+    def pending(self, max_attempts):
+        return self.filter(
+            sent__isnull=True,
+            attempts__lt=max_attempts,
+            next_attempt__lte=timezone.now()
+        )
+
+
+class OutgoingEmail(models.Model):
+    """Email waiting in the outbox for the send_outbox worker."""
+    subject = models.CharField('subject', max_length=255)
+    message = models.TextField('message')
+    from_email = models.CharField('from', max_length=254, blank=True)
+    recipient = models.EmailField('recipient', max_length=254)
+    created = models.DateTimeField('created', auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField('attempts', default=0)
+    next_attempt = models.DateTimeField('next attempt', default=timezone.now)
+    sent = models.DateTimeField('sent', null=True, blank=True)
+    last_error = models.TextField('last error', blank=True)
+
+    objects = OutgoingEmailQuerySet.as_manager()
+
+    class Meta:
+        ordering = ('next_attempt', 'id')
+        indexes = (
+            models.Index(
+                fields=('sent', 'next_attempt'), name='outbox_pending_idx'),
+        )
+        verbose_name = 'outgoing email'
+        verbose_name_plural = 'outgoing emails'
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,31 @@
+import os
+import tempfile
+
+from api_yamdb.settings import *  # noqa: F401,F403
+
+# A file rather than an in-memory database: threads of the concurrency
+# tests then wait for each other's write locks instead of failing.
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+        'TEST': {
+            'NAME': os.path.join(
+                tempfile.gettempdir(), f'yamdb-test-{os.getpid()}.sqlite3'),
+        },
+    }
+}
+
+# Stands in for a read replica; tests/test_replicas.py routes reads to it.
+DATABASES['replica'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': ':memory:',
+    'TEST': {'MIRROR': 'default'},
+}
+
+# Each test opts in to metrics with its own directory.
+METRICS_ENABLED = False
+
+# Time every request and show it, as in development.
+REQUEST_TIMING_SAMPLE_RATE = 1
+REQUEST_TIMING_HEADER = True
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from .test_titles import create_titles
+
+
+def http_scope(method, path, query_string=b''):
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': method,
+        'path': path,
+        'query_string': query_string,
+        'headers': [(b'host', b'testserver')],
+    }
+
+
+def call(application, scope, body=b''):
+    """Run one request through the ASGI application, return the messages."""
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    return messages
+
+
+@pytest.fixture
+def application():
+    from django.core.wsgi import get_wsgi_application
+
+    from api_yamdb.asgi_handlers import AsyncReadApplication
+
+    application = AsyncReadApplication(get_wsgi_application())
+    yield application
+    application.executor.shutdown(wait=True)
+
+
+class TestReadRoutes:
+
+    @pytest.mark.parametrize('method,path,expected', (
+        ('GET', '/api/v1/titles/', True),
+        ('HEAD', '/api/v1/titles/1/reviews/', True),
+        ('GET', '/api/v1/titles/1/reviews/2/comments/', True),
+        ('GET', '/api/v1/titles/1/', False),
+        ('POST', '/api/v1/titles/', False),
+        ('GET', '/missing/', False),
+    ))
+    def test_is_read(self, method, path, expected):
+        from api_yamdb.asgi_handlers import AsyncReadApplication
+
+        assert AsyncReadApplication.is_read(
+            http_scope(method, path)) is expected
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncReadApplication:
+
+    def test_list_runs_in_read_pool(self, application, monkeypatch):
+        from api.views import TitlesViewSet
+
+        create_titles(2)
+        threads = []
+        list_titles = TitlesViewSet.list
+
+        def record(self, request, *args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return list_titles(self, request, *args, **kwargs)
+
+        monkeypatch.setattr(TitlesViewSet, 'list', record)
+
+        start, body = call(application, http_scope('GET', '/api/v1/titles/'))
+
+        assert start['status'] == 200
+        assert json.loads(body['body'])['count'] == 2
+        assert threads[0].startswith('asgi-read'), (
+            'Проверьте, что список произведений обрабатывается в пуле '
+            'потоков для чтения'
+        )
+
+    def test_head_has_no_body(self, application):
+        start, body = call(application, http_scope('HEAD', '/api/v1/titles/'))
+
+        assert start['status'] == 200
+        assert body['body'] == b''
+
+    def test_other_requests_fall_back(self, application):
+        messages = call(
+            application,
+            http_scope('POST', '/api/v1/auth/signup/'),
+        )
+
+        assert messages[0]['status'] == 400, (
+            'Проверьте, что остальные запросы обрабатываются через WSGI'
+        )
@@ -0,0 +1,75 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    from api.authentication import _users
+
+    _users.clear()
+
+
+def auth_header(user):
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    return {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+
+
+def user_queries(context):
+    return [
+        query for query in context.captured_queries
+        if 'FROM "users_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+
+    def test_user_is_loaded_once(self, client, user):
+        header = auth_header(user)
+        assert client.get('/api/v1/users/me/', **header).status_code == 200
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/', **header)
+
+        assert response.status_code == 200
+        assert not user_queries(context), (
+            'Проверьте, что пользователь из токена берётся из кеша'
+        )
+
+    def test_role_change_is_seen(self, client, user):
+        header = auth_header(user)
+        assert client.get('/api/v1/users/', **header).status_code == 403
+
+        user.role = 'admin'
+        user.save()
+
+        assert client.get('/api/v1/users/', **header).status_code == 200, (
+            'Проверьте, что смена роли сбрасывает кеш пользователя'
+        )
+
+    def test_inactive_user_is_rejected(self, client, user):
+        header = auth_header(user)
+        user.is_active = False
+        user.save()
+
+        assert client.get('/api/v1/users/me/', **header).status_code == 401
+
+    def test_change_in_other_process_is_seen(self, client, user):
+        from api.authentication import user_label
+        from api.cache import bump_version
+        from users.models import User
+
+        header = auth_header(user)
+        assert client.get('/api/v1/users/', **header).status_code == 403
+
+        # Another process saved the user: the row and the shared version
+        # changed, the users cached in this process did not.
+        User.objects.filter(pk=user.pk).update(role='admin')
+        bump_version(user_label(user.pk))
+
+        assert client.get('/api/v1/users/', **header).status_code == 200, (
+            'Проверьте, что изменение пользователя в другом процессе '
+            'сбрасывает его кеш'
+        )
@@ -0,0 +1,100 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestBenchmarks:
+
+    def test_seed(self):
+        from api.benchmarks import seed
+        from reviews.models import Comment, Review, Title
+
+        admin = seed(titles=4, reviews=3, comments=2)
+
+        assert admin.is_superuser
+        assert Title.objects.count() == 4
+        assert Review.objects.count() == 12
+        assert Comment.objects.count() == 24
+        assert not Title.objects.filter(rating__isnull=True).exists(), (
+            'Проверьте, что после заполнения базы пересчитаны рейтинги'
+        )
+
+    def test_measure(self):
+        from api.benchmarks import get_clients, get_scenarios, measure, seed
+
+        clients = get_clients(seed(titles=2, reviews=1, comments=1))
+        for scenario in get_scenarios():
+            result = measure(clients, scenario, requests=2, warmup=0)
+            assert result['errors'] == 0, (
+                f'Проверьте, что сценарий {scenario.name} выполняется '
+                'без ошибок'
+            )
+            assert result['p50_ms'] <= result['p99_ms']
+
+
+class TestCompare:
+    baseline = {
+        'titles-list': {'p50_ms': 10, 'queries': 3},
+        'signup': {'p50_ms': 10, 'queries': 4},
+    }
+
+    def test_no_regressions(self):
+        from api.benchmarks import compare
+
+        results = {
+            'titles-list': {'p50_ms': 11, 'queries': 3},
+            'signup': {'p50_ms': 5, 'queries': 2},
+            'token': {'p50_ms': 50, 'queries': 9},
+        }
+        assert compare(results, self.baseline, max_regression=20) == []
+
+    def test_regressions(self):
+        from api.benchmarks import compare
+
+        results = {
+            'titles-list': {'p50_ms': 13, 'queries': 3},
+            'signup': {'p50_ms': 10, 'queries': 5},
+        }
+        assert len(compare(results, self.baseline, max_regression=20)) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsgiBenchmark:
+
+    def test_measure_asgi(self):
+        from api.benchmarks import asgi_scenarios, measure_asgi, seed
+
+        seed(titles=2, reviews=1, comments=1)
+        for scenario in asgi_scenarios():
+            results = measure_asgi(
+                scenario, requests=4, concurrency=2, client_delay=0,
+                threads=2)
+            assert set(results) == {'sync', 'async'}
+            assert results['sync']['errors'] == 0
+            assert results['async']['errors'] == 0, (
+                f'Проверьте, что {scenario.name} отвечает без ошибок '
+                'в режиме ASGI'
+            )
+
+
+@pytest.mark.django_db
+class TestScreenBenchmark:
+
+    def test_measure_screen(self):
+        from api.benchmarks import (get_clients, measure_screen, screen_lists,
+                                    screen_variants, seed)
+
+        client = get_clients(seed(titles=12, reviews=1, comments=1))[
+            'anonymous']
+        name, path, rows = screen_lists()[0]
+        variants = screen_variants(path, 10)
+
+        results = {
+            variant: measure_screen(client, url, 10, screens=2, warmup=0)
+            for variant, url in variants.items()
+        }
+
+        assert results['default']['requests_per_screen'] == 2
+        assert results['10']['requests_per_screen'] == 1, (
+            'Проверьте, что с `page_size` экран заполняется одним запросом'
+        )
+        assert results['10-uncounted']['requests_per_screen'] == 1
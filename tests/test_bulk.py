@@ -0,0 +1,220 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .test_titles import create_titles
+
+
+@pytest.fixture
+def moderator_client(django_user_model):
+    from rest_framework.test import APIClient
+
+    moderator = django_user_model.objects.create_user(
+        username='TestModerator', email='testmoderator@yamdb.fake',
+        password='1234567', role='moderator'
+    )
+    client = APIClient()
+    client.force_authenticate(user=moderator)
+    return client
+
+
+def create_authors(django_user_model, count):
+    return [
+        django_user_model.objects.create_user(
+            username=f'author{index}', email=f'author{index}@yamdb.fake')
+        for index in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestBulkTitles:
+
+    def test_bulk_create(self, admin_client):
+        from reviews.models import Genre, Title
+
+        create_titles(0)
+        Genre.objects.create(name='Комедия', slug='comedy')
+        items = [
+            {'name': f'Новое {index}', 'year': 2001, 'category': 'movie',
+             'genre': ['drama', 'comedy']}
+            for index in range(20)
+        ]
+
+        response = admin_client.post(
+            '/api/v1/titles/bulk/', items, format='json')
+
+        assert response.status_code == 201
+        data = response.json()
+        assert [title['name'] for title in data] == [
+            item['name'] for item in items
+        ], 'Проверьте, что ответ содержит созданные произведения по порядку'
+        assert all(len(title['genre']) == 2 for title in data)
+        assert Title.objects.count() == 20
+
+    def test_bulk_create_errors(self, admin_client):
+        from reviews.models import Title
+
+        create_titles(0)
+        items = [
+            {'name': 'Верное', 'year': 2001, 'category': 'movie',
+             'genre': ['drama']},
+            {'name': 'Неверное', 'year': 2001, 'category': 'book',
+             'genre': ['drama', 'horror']},
+        ]
+
+        response = admin_client.post(
+            '/api/v1/titles/bulk/', items, format='json')
+
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {} and set(errors[1]) == {'category', 'genre'}, (
+            'Проверьте, что ошибки возвращаются для каждого объекта'
+        )
+        assert not Title.objects.exists(), (
+            'Проверьте, что при ошибке не создаётся ни одного объекта'
+        )
+
+    def test_bulk_create_permissions(self, user_client, moderator_client):
+        for client in (user_client, moderator_client):
+            response = client.post('/api/v1/titles/bulk/', [], format='json')
+            assert response.status_code == 403
+
+
+@pytest.mark.django_db
+class TestBulkReviews:
+
+    def test_bulk_import(self, moderator_client, django_user_model):
+        title, = create_titles(1)
+        authors = create_authors(django_user_model, 30)
+        items = [
+            {'author': author.username, 'text': 'Отзыв', 'score': 4}
+            for author in authors
+        ]
+
+        with CaptureQueriesContext(connection) as context:
+            response = moderator_client.post(
+                f'/api/v1/titles/{title.id}/reviews/bulk/', items,
+                format='json')
+
+        assert response.status_code == 201
+        data = response.json()
+        assert all(review['id'] for review in data)
+        assert [review['author'] for review in data] == [
+            author.username for author in authors
+        ]
+        assert len(context.captured_queries) < 15, (
+            'Проверьте, что пакет отзывов проверяется и сохраняется '
+            'фиксированным числом запросов'
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            120, 30, 4.0
+        ), 'Проверьте, что рейтинг произведения учитывает пакет отзывов'
+
+    def test_bulk_import_errors(self, moderator_client, user):
+        from reviews.models import Review
+
+        title, = create_titles(1)
+        Review.objects.create(title=title, author=user, text='Отзыв')
+        items = [
+            {'author': user.username, 'text': 'Отзыв', 'score': 4},
+            {'author': 'nobody', 'text': 'Отзыв', 'score': 4},
+            {'author': 'TestModerator', 'text': 'Отзыв', 'score': 11},
+        ]
+
+        response = moderator_client.post(
+            f'/api/v1/titles/{title.id}/reviews/bulk/', items, format='json')
+
+        assert response.status_code == 400
+        errors = response.json()
+        assert len(errors) == 3 and all(errors), (
+            'Проверьте, что ошибки возвращаются для каждого отзыва'
+        )
+        assert Review.objects.count() == 1
+
+    def test_bulk_import_concurrent_review(self, moderator_client, user,
+                                           monkeypatch):
+        from api.serializers import ReviewBulkSerializer
+        from reviews.models import Review
+
+        title, = create_titles(1)
+        validate_batch = ReviewBulkSerializer.validate_batch
+
+        def validate_then_review(serializer, items):
+            errors = validate_batch(serializer, items)
+            # A single POST by the same author lands meanwhile.
+            Review.objects.create(
+                title=title, author=user, text='Отзыв', score=2)
+            return errors
+
+        monkeypatch.setattr(
+            ReviewBulkSerializer, 'validate_batch', validate_then_review)
+
+        response = moderator_client.post(
+            f'/api/v1/titles/{title.id}/reviews/bulk/',
+            [{'author': user.username, 'text': 'Отзыв', 'score': 4}],
+            format='json')
+
+        assert response.status_code == 400, (
+            'Проверьте, что конфликт с параллельно созданным отзывом '
+            'возвращает ошибку валидации'
+        )
+        title.refresh_from_db()
+        assert (Review.objects.count(), title.rating) == (1, 2.0)
+
+    def test_bulk_import_missing_title(self, moderator_client):
+        response = moderator_client.post(
+            '/api/v1/titles/1/reviews/bulk/', [], format='json')
+        assert response.status_code == 404
+
+    def test_bulk_import_permissions(self, user_client):
+        title, = create_titles(1)
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/bulk/', [], format='json')
+        assert response.status_code == 403
+
+
+@pytest.mark.django_db
+class TestBulkComments:
+
+    def test_bulk_delete(self, moderator_client, user):
+        from reviews.models import Comment, Review
+
+        title, = create_titles(1)
+        review = Review.objects.create(title=title, author=user, text='Отзыв')
+        comments = [
+            Comment.objects.create(review=review, author=user, text='Спам')
+            for _ in range(3)
+        ]
+        ids = [comments[0].id, comments[1].id, 999]
+
+        response = moderator_client.delete(
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/bulk/',
+            {'ids': ids}, format='json')
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {'id': comments[0].id, 'status': 204},
+            {'id': comments[1].id, 'status': 204},
+            {'id': 999, 'status': 404},
+        ], 'Проверьте, что результат возвращается для каждого комментария'
+        assert list(Comment.objects.values_list('id', flat=True)) == [
+            comments[2].id
+        ]
+
+    def test_bulk_delete_other_review(self, moderator_client, user):
+        from reviews.models import Comment, Review
+
+        first, second = create_titles(2)
+        review = Review.objects.create(title=first, author=user, text='Отзыв')
+        comment = Comment.objects.create(
+            review=review, author=user, text='Текст')
+
+        response = moderator_client.delete(
+            f'/api/v1/titles/{second.id}/reviews/{review.id}/comments/bulk/',
+            {'ids': [comment.id]}, format='json')
+
+        assert response.json() == [{'id': comment.id, 'status': 404}]
+        assert Comment.objects.exists(), (
+            'Проверьте, что удаляются только комментарии отзыва из запроса'
+        )
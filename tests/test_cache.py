@@ -0,0 +1,100 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .test_titles import create_titles
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def test_titles_list_is_cached(self, client):
+        create_titles(3)
+        first = client.get('/api/v1/titles/?year=2000')
+
+        with CaptureQueriesContext(connection) as context:
+            second = client.get('/api/v1/titles/?year=2000')
+
+        assert second.json() == first.json()
+        assert not context.captured_queries, (
+            'Проверьте, что повторный запрос списка произведений '
+            'обслуживается из кеша'
+        )
+
+    def test_query_string_is_part_of_key(self, client):
+        create_titles(3)
+        client.get('/api/v1/titles/?year=2000')
+
+        response = client.get('/api/v1/titles/?year=1999')
+
+        assert response.json()['count'] == 0
+
+    def test_writes_invalidate_cache(self, client, admin_client, user,
+                                     django_capture_on_commit_callbacks):
+        title, = create_titles(1)
+        assert client.get('/api/v1/genres/').json()['count'] == 1
+        assert client.get(f'/api/v1/titles/{title.id}/').json()[
+            'rating'] is None
+
+        with django_capture_on_commit_callbacks(execute=True):
+            admin_client.post(
+                '/api/v1/genres/', data={'name': 'Комедия', 'slug': 'comedy'})
+            title.reviews.create(author=user, text='Отзыв', score=6)
+
+        assert client.get('/api/v1/genres/').json()['count'] == 2, (
+            'Проверьте, что создание жанра сбрасывает кеш списка жанров'
+        )
+        assert client.get(f'/api/v1/titles/{title.id}/').json()[
+            'rating'] == 6.0, (
+            'Проверьте, что новый отзыв сбрасывает кеш произведения'
+        )
+
+
+class TestSharedVersions:
+
+    @staticmethod
+    def use_cache(monkeypatch, instance):
+        import api.cache
+        import api.mixins
+
+        monkeypatch.setattr(api.cache, 'cache', instance)
+        monkeypatch.setattr(api.mixins, 'cache', instance)
+
+    @pytest.mark.django_db
+    def test_bump_reaches_other_process(self, client, monkeypatch, tmp_path):
+        from api.cache import bump_version
+        from django.core.cache.backends.filebased import FileBasedCache
+
+        # Two workers, each with its own handle on the shared cache.
+        first, second = (
+            FileBasedCache(str(tmp_path), {}) for _ in range(2))
+        create_titles(1)
+        self.use_cache(monkeypatch, first)
+        etag = client.get('/api/v1/genres/')['ETag']
+
+        self.use_cache(monkeypatch, second)
+        bump_version('reviews.genre')
+
+        self.use_cache(monkeypatch, first)
+        response = client.get('/api/v1/genres/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что изменение версии в одном процессе меняет '
+            'валидатор в другом'
+        )
+        assert response['ETag'] != etag
+
+    def test_per_process_cache_refused(self, settings):
+        from api.cache import check_shared_cache
+        from django.core.exceptions import ImproperlyConfigured
+
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        check_shared_cache(1)
+        with pytest.raises(ImproperlyConfigured):
+            check_shared_cache(3)
+
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.'
+                       'FileBasedCache',
+            'LOCATION': '/tmp/yamdb-cache'}}
+        check_shared_cache(3)
@@ -0,0 +1,84 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .test_titles import create_titles
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_titles_not_modified(self, client):
+        create_titles(3)
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert response.has_header('ETag')
+        assert response.has_header('Last-Modified')
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                '/api/v1/titles/', HTTP_IF_NONE_MATCH=response['ETag'])
+
+        assert response.status_code == 304, (
+            'Проверьте, что запрос с совпадающим ETag получает ответ 304'
+        )
+        assert not context.captured_queries
+
+    def test_if_modified_since(self, client):
+        title, = create_titles(1)
+        response = client.get(f'/api/v1/titles/{title.id}/')
+
+        response = client.get(
+            f'/api/v1/titles/{title.id}/',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+
+        assert response.status_code == 304
+
+    def test_reviews_validator_follows_new_reviews(
+            self, client, user, admin, django_capture_on_commit_callbacks):
+        title, = create_titles(1)
+        title.reviews.create(author=user, text='Отзыв', score=5)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        etag = client.get(url)['ETag']
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert not context.captured_queries, (
+            'Проверьте, что для ответа 304 отзывы не загружаются'
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            title.reviews.create(author=admin, text='Отзыв', score=7)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что ETag списка отзывов меняется с новым отзывом'
+        )
+        assert len(response.json()['results']) == 2
+
+    @pytest.mark.parametrize('query', ('', '?cursor=', '?count=false'))
+    def test_reviews_list_without_aggregate(self, client, user, query):
+        title, = create_titles(1)
+        title.reviews.create(author=user, text='Отзыв', score=5)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                f'/api/v1/titles/{title.id}/reviews/{query}')
+
+        assert response.status_code == 200
+        counts = [
+            captured for captured in context.captured_queries
+            if 'COUNT(' in captured['sql'].upper()
+        ]
+        assert len(counts) == (1 if not query else 0), (
+            'Проверьте, что валидаторы списка не выполняют COUNT'
+        )
+
+    def test_any_etag_on_missing_parent(self, client):
+        response = client.get(
+            '/api/v1/titles/999/reviews/', HTTP_IF_NONE_MATCH='*')
+
+        assert response.status_code == 404, (
+            'Проверьте, что `If-None-Match: *` не скрывает отсутствие '
+            'произведения'
+        )
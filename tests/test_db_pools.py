@@ -0,0 +1,188 @@
+import time
+
+import psycopg2
+import pytest
+from psycopg2 import extensions
+
+
+@pytest.mark.django_db
+class TestDatabasePools:
+    url = '/api/v1/db-pools/'
+
+    def test_admin_gets_pool_stats(self, admin_client):
+        response = admin_client.get(self.url)
+
+        assert response.status_code == 200
+        assert response.json() == {}, (
+            'Проверьте, что без пула соединений отдаётся пустой словарь'
+        )
+
+    def test_not_available_to_users(self, client, user_client):
+        assert client.get(self.url).status_code == 401
+        assert user_client.get(self.url).status_code == 403
+
+
+class FakeCursor:
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql):
+        if self.connection.broken:
+            raise psycopg2.OperationalError('server closed the connection')
+
+
+class FakeConnection:
+    autocommit = False
+    broken = False
+    closed = 0
+    isolation_level = extensions.ISOLATION_LEVEL_READ_COMMITTED
+
+    def __init__(self):
+        self.info = type('Info', (), {
+            'transaction_status': extensions.TRANSACTION_STATUS_IDLE})()
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+    def set_client_encoding(self, encoding):
+        pass
+
+    def get_parameter_status(self, name):
+        return 'UTC'
+
+
+@pytest.fixture
+def make_pool(monkeypatch):
+    from api_yamdb.db_backends.postgresql_pool.pool import ConnectionPool
+
+    monkeypatch.setattr(
+        psycopg2, 'connect', lambda *args, **kwargs: FakeConnection())
+
+    def make_pool(max_size=2, timeout=0.05, check_interval=30):
+        return ConnectionPool(1, max_size, timeout, check_interval)
+    return make_pool
+
+
+class TestConnectionPool:
+
+    def test_exhausted_pool_times_out(self, make_pool):
+        pool = make_pool(max_size=1, timeout=0.1)
+        pool.checkout()
+
+        started = time.monotonic()
+        with pytest.raises(psycopg2.OperationalError):
+            pool.checkout()
+
+        assert time.monotonic() - started >= 0.1, (
+            'Проверьте, что при занятом пуле выдача соединения ждёт timeout'
+        )
+        assert pool.stats()['waits'] == 1
+
+    def test_closed_connection_is_discarded(self, make_pool):
+        pool = make_pool()
+        connection = pool.checkout()
+        connection.close()
+
+        pool.checkin(connection)
+
+        assert pool.checkout() is not connection, (
+            'Проверьте, что закрытое соединение не возвращается в пул'
+        )
+
+    def test_broken_connection_is_replaced(self, make_pool):
+        pool = make_pool(check_interval=0)
+        connection = pool.checkout()
+        pool.checkin(connection)
+        connection.broken = True
+
+        replacement = pool.checkout()
+
+        assert replacement is not connection
+        assert connection.closed, (
+            'Проверьте, что соединение, не ответившее на проверку, '
+            'закрывается'
+        )
+        assert pool.stats()['discarded'] == 1
+
+    def test_double_checkin(self, make_pool):
+        pool = make_pool(max_size=1)
+        connection = pool.checkout()
+
+        pool.checkin(connection)
+        pool.checkin(connection)
+
+        pool.checkout()
+        with pytest.raises(psycopg2.OperationalError):
+            pool.checkout()
+        assert pool.stats()['in_use'] == 1, (
+            'Проверьте, что повторный возврат соединения не увеличивает пул'
+        )
+
+    def test_stats(self, make_pool):
+        pool = make_pool(max_size=3)
+        first, second = pool.checkout(), pool.checkout()
+        pool.checkin(first)
+
+        assert pool.stats() == {
+            'max_size': 3,
+            'in_use': 1,
+            'idle': 1,
+            'checkouts': 2,
+            'waits': 0,
+            'discarded': 0,
+        }
+
+
+class TestPooledBackend:
+
+    # Lets the wrapper connect; it never reaches the test database.
+    @pytest.mark.django_db
+    def test_connection_returns_after_request(self, make_pool, monkeypatch):
+        from api_yamdb.db_backends.postgresql_pool import pool
+        from api_yamdb.db_backends.postgresql_pool.base import DatabaseWrapper
+
+        monkeypatch.setattr(pool, '_pools', {})
+        wrapper = DatabaseWrapper({
+            'ENGINE': pool.ENGINE, 'NAME': 'yamdb', 'USER': '',
+            'PASSWORD': '', 'HOST': '', 'PORT': '', 'OPTIONS': {},
+            'AUTOCOMMIT': True, 'CONN_MAX_AGE': 60, 'TIME_ZONE': None,
+            'POOL': {'MAX_SIZE': 2},
+        }, 'pooled')
+
+        wrapper.connect()
+        assert pool.pool_stats()['pooled']['in_use'] == 1
+        # What request_finished does through close_old_connections().
+        wrapper.close_if_unusable_or_obsolete()
+
+        assert pool.pool_stats()['pooled']['in_use'] == 0, (
+            'Проверьте, что соединение возвращается в пул после каждого '
+            'запроса, несмотря на CONN_MAX_AGE'
+        )
+
+    def test_threads_fit_pool(self):
+        from api_yamdb.db_backends.postgresql_pool.pool import (
+            ENGINE, check_pool_size)
+        from django.core.exceptions import ImproperlyConfigured
+
+        databases = {'default': {'ENGINE': ENGINE, 'POOL': {'MAX_SIZE': 4}}}
+        check_pool_size(databases, 4)
+        with pytest.raises(ImproperlyConfigured):
+            check_pool_size(databases, 8)
+        check_pool_size(
+            {'default': {'ENGINE': 'django.db.backends.postgresql'}}, 8)
@@ -0,0 +1,55 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .test_titles import create_titles
+
+
+@pytest.mark.django_db
+class TestExport:
+
+    def create_catalogue(self, user):
+        title, = create_titles(1)
+        review = title.reviews.create(author=user, text='Отзыв', score=5)
+        review.comments.create(author=user, text='Комментарий')
+        return title
+
+    def test_export_is_admin_only(self, client, user_client):
+        assert client.get('/api/v1/export/ndjson/').status_code == 401
+        assert user_client.get('/api/v1/export/ndjson/').status_code == 403
+
+    def test_export_ndjson(self, admin_client, user):
+        title = self.create_catalogue(user)
+
+        response = admin_client.get('/api/v1/export/ndjson/')
+
+        assert response.status_code == 200
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоковым ответом'
+        )
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        assert [row['type'] for row in rows] == ['title', 'review', 'comment']
+        assert rows[0]['category'] == 'movie'
+        assert rows[2]['title_id'] == title.id
+        assert rows[2]['author'] == user.username
+
+    def test_export_csv_command(self, user, tmp_path):
+        self.create_catalogue(user)
+        output = tmp_path / 'catalogue.csv'
+
+        call_command('export_catalogue', '--format', 'csv',
+                     '--output', str(output), stdout=StringIO())
+
+        with open(output, encoding='utf-8', newline='') as file:
+            rows = list(csv.DictReader(file))
+        assert [row['type'] for row in rows] == ['title', 'review', 'comment']
+        assert rows[1]['score'] == '5'
+
+    def test_unknown_format(self, admin_client):
+        assert admin_client.get('/api/v1/export/xml/').status_code == 404
@@ -0,0 +1,117 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .test_titles import create_titles
+
+
+@pytest.mark.django_db
+class TestTitleFields:
+
+    def test_fields(self, client):
+        create_titles(3)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/?fields=id,name,rating')
+
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert set(results[0]) == {'id', 'name', 'rating'}, (
+            'Проверьте, что параметр `fields` оставляет только '
+            'перечисленные поля'
+        )
+        sql = ' '.join(
+            query['sql'] for query in context.captured_queries).lower()
+        assert 'description' not in sql and 'reviews_genre' not in sql, (
+            'Проверьте, что для неотображаемых полей не загружаются '
+            'описания и жанры'
+        )
+        assert len(context.captured_queries) == 2
+
+    def test_omit(self, client):
+        create_titles(1)
+
+        response = client.get('/api/v1/titles/?omit=description,genre')
+
+        assert set(response.json()['results'][0]) == {
+            'id', 'name', 'year', 'category', 'rating'
+        }
+
+    def test_omit_keeps_relations(self, client):
+        create_titles(1)
+
+        response = client.get('/api/v1/titles/?omit=description')
+
+        title = response.json()['results'][0]
+        assert title['category'] == {'name': 'Фильм', 'slug': 'movie'}, (
+            'Проверьте, что `omit` не меняет вид оставшихся связей'
+        )
+        assert title['genre'] == [{'name': 'Драма', 'slug': 'drama'}]
+
+    def test_expand(self, client):
+        title, = create_titles(1)
+
+        compact = client.get(
+            '/api/v1/titles/?fields=name,genre,category').json()['results']
+        expanded = client.get(
+            f'/api/v1/titles/{title.id}/?fields=name,genre,category'
+            '&expand=genre'
+        ).json()
+
+        assert compact == [
+            {'name': title.name, 'genre': ['drama'], 'category': 'movie'}
+        ], 'Проверьте, что без `expand` связи выводятся слагами'
+        assert expanded == {
+            'name': title.name,
+            'genre': [{'name': 'Драма', 'slug': 'drama'}],
+            'category': 'movie',
+        }, 'Проверьте, что `expand` выводит связанные объекты целиком'
+
+    def test_default_unchanged(self, client):
+        create_titles(1)
+
+        title = client.get('/api/v1/titles/').json()['results'][0]
+
+        assert set(title) == {
+            'id', 'name', 'year', 'description', 'genre', 'category',
+            'rating'
+        }
+        assert title['category'] == {'name': 'Фильм', 'slug': 'movie'}
+
+    def test_unknown_field(self, client):
+        response = client.get('/api/v1/titles/?fields=name,budget')
+
+        assert response.status_code == 400
+        assert 'budget' in response.json()['fields'][0]
+
+
+@pytest.mark.django_db
+class TestReviewFields:
+
+    def test_fields(self, client, user):
+        from reviews.models import Review
+
+        title, = create_titles(1)
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                f'/api/v1/titles/{title.id}/reviews/?fields=id,score')
+
+        assert response.json()['results'] == [{'id': review.id, 'score': 5}]
+        page = context.captured_queries[-1]['sql'].lower()
+        assert '"text"' not in page and 'users_user' not in page, (
+            'Проверьте, что текст отзыва и автор не загружаются, '
+            'если они не запрошены'
+        )
+
+    def test_create_ignores_fields(self, user_client):
+        title, = create_titles(1)
+
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/?fields=id',
+            {'text': 'Отзыв', 'score': 5})
+
+        assert response.status_code == 201
+        assert response.json()['text'] == 'Отзыв'
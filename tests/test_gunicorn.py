@@ -0,0 +1,116 @@
+import os
+import runpy
+import threading
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from django.conf import settings
+
+
+def load_config(monkeypatch, **env):
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path(os.path.join(settings.BASE_DIR, 'gunicorn.conf.py'))
+
+
+class TestGunicornConfig:
+
+    def test_defaults(self, monkeypatch):
+        monkeypatch.delenv('CACHE_BACKEND', raising=False)
+        config = load_config(monkeypatch)
+
+        assert config['worker_class'] == 'gthread'
+        assert config['threads'] == 4
+        assert config['workers'] == 1, (
+            'Проверьте, что без общего кеша запускается один воркер'
+        )
+        assert config['max_requests'] and config['max_requests_jitter'], (
+            'Проверьте, что воркеры перезапускаются после max_requests '
+            'со случайным разбросом'
+        )
+        assert config['preload_app'] is True
+
+    def test_shared_cache_workers(self, monkeypatch):
+        config = load_config(
+            monkeypatch,
+            CACHE_BACKEND='django.core.cache.backends.filebased.'
+                          'FileBasedCache')
+
+        assert config['workers'] == min(config['cpu_count']() * 2 + 1, 12)
+
+    def test_workers_need_shared_cache(self, monkeypatch, settings, tmp_path):
+        settings.METRICS_DIR = str(tmp_path)
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        on_starting = load_config(monkeypatch)['on_starting']
+
+        with pytest.raises(RuntimeError):
+            on_starting(SimpleNamespace(
+                num_workers=3, cfg=SimpleNamespace(threads=4)))
+        on_starting(SimpleNamespace(
+            num_workers=1, cfg=SimpleNamespace(threads=4)))
+
+    def test_threads_need_pooled_connections(self, monkeypatch, settings,
+                                             tmp_path):
+        settings.METRICS_DIR = str(tmp_path)
+        settings.DATABASES = {'default': {
+            'ENGINE': 'api_yamdb.db_backends.postgresql_pool',
+            'POOL': {'MAX_SIZE': 2}}}
+        on_starting = load_config(monkeypatch)['on_starting']
+
+        with pytest.raises(RuntimeError):
+            on_starting(SimpleNamespace(
+                num_workers=1, cfg=SimpleNamespace(threads=4)))
+
+    def test_environment(self, monkeypatch):
+        config = load_config(
+            monkeypatch, GUNICORN_WORKER_CLASS='sync', GUNICORN_WORKERS='3',
+            GUNICORN_PRELOAD='False')
+
+        assert config['workers'] == 3
+        assert config['threads'] == 1
+        assert config['preload_app'] is False
+
+    def test_warmup(self, monkeypatch):
+        load_config(monkeypatch)['warmup']()
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        status = 404 if self.path == '/missing/' else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), OkHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+class TestLoadClients:
+
+    def test_run_clients(self, server):
+        from api.management.commands.load_test import run_clients
+
+        result = run_clients(
+            server.server_address[1], ('/', '/missing/'), concurrency=2,
+            duration=0.3)
+
+        assert result['requests'] > 0
+        assert 0 < result['errors'] < result['requests'], (
+            'Проверьте, что ответы с ошибкой считаются отдельно'
+        )
@@ -0,0 +1,101 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+FILES = {
+    'categories.csv': 'id,name,slug\n1,Фильм,movie\n2,Книга,book\n',
+    'genres.csv': 'id,name,slug\n1,Драма,drama\n2,Комедия,comedy\n',
+    'titles.csv': (
+        'id,name,year,category\n'
+        '1,Первое,2000,movie\n'
+        '2,Второе,2001,book\n'
+        '3,Третье,2002,2\n'
+    ),
+    'genre_title.csv': 'id,title_id,genre\n1,1,drama\n2,1,comedy\n3,2,2\n',
+    'users.csv': (
+        'id,username,email,role\n'
+        '1,reader,reader@yamdb.fake,user\n'
+        '2,boss,boss@yamdb.fake,admin\n'
+    ),
+    'reviews.csv': (
+        'id,title_id,text,author,score,pub_date\n'
+        '1,1,Хорошо,reader,8,2019-09-24T21:08:21.567Z\n'
+        '2,1,Плохо,boss,2,2019-09-25T21:08:21.567Z\n'
+    ),
+    'comments.csv': 'id,review_id,text,author\n1,1,Согласен,boss\n',
+}
+
+
+def write_files(path, files):
+    for name, content in files.items():
+        (path / name).write_text(content, encoding='utf-8')
+
+
+@pytest.mark.django_db
+class TestImportCatalogue:
+
+    def test_import_csv(self, tmp_path):
+        from reviews.models import Comment, Review, Title
+        from users.models import User
+
+        write_files(tmp_path, FILES)
+
+        call_command('import_catalogue', str(tmp_path), '--batch-size', '2',
+                     stdout=StringIO())
+
+        assert Title.objects.count() == 3
+        assert Title.objects.get(pk=3).category.slug == 'book'
+        assert set(Title.objects.get(pk=1).genre.values_list(
+            'slug', flat=True)) == {'drama', 'comedy'}
+        assert User.objects.get(username='boss').is_staff
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что импорт сохраняет дату публикации отзыва'
+        )
+        assert Title.objects.get(pk=1).rating == 5.0, (
+            'Проверьте, что после импорта пересчитываются рейтинги'
+        )
+        assert Comment.objects.get().author.username == 'boss'
+
+    def test_import_jsonl(self, tmp_path):
+        from reviews.models import Genre
+
+        (tmp_path / 'genres.jsonl').write_text(
+            '\n'.join(json.dumps({'name': name, 'slug': slug})
+                      for name, slug in (('Драма', 'drama'),
+                                         ('Комедия', 'comedy'))),
+            encoding='utf-8')
+
+        call_command('import_catalogue', str(tmp_path), '--format', 'jsonl',
+                     stdout=StringIO())
+
+        assert set(Genre.objects.values_list('slug', flat=True)) == {
+            'drama', 'comedy'
+        }
+
+    def test_resume_after_failure(self, tmp_path):
+        from reviews.models import Review
+
+        files = dict(FILES)
+        files['reviews.csv'] += '3,1,Снова,nobody,5,\n'
+        write_files(tmp_path, files)
+
+        with pytest.raises(CommandError):
+            call_command('import_catalogue', str(tmp_path),
+                         '--batch-size', '2', stdout=StringIO())
+        state = json.loads(
+            (tmp_path / '.import_state.json').read_text(encoding='utf-8'))
+        assert state['reviews'] == 2
+        assert Review.objects.count() == 2
+
+        files['reviews.csv'] = FILES['reviews.csv'] + '3,2,Снова,2,5,\n'
+        write_files(tmp_path, files)
+        call_command('import_catalogue', str(tmp_path), '--resume',
+                     '--batch-size', '2', stdout=StringIO())
+
+        assert Review.objects.count() == 3, (
+            'Проверьте, что импорт продолжается с места сбоя'
+        )
+        assert not (tmp_path / '.import_state.json').exists()
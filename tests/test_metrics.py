@@ -0,0 +1,113 @@
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture
+def metrics_dir(settings, tmp_path, monkeypatch):
+    from api_yamdb import metrics
+
+    settings.METRICS_ENABLED = True
+    settings.METRICS_DIR = str(tmp_path)
+    monkeypatch.setattr(metrics, '_counters', type(metrics._counters)(float))
+    monkeypatch.setattr(metrics, '_histograms', {})
+    return tmp_path
+
+
+def metric_lines(response):
+    return response.content.decode().splitlines()
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    url = '/metrics'
+
+    def test_request_metrics(self, client, metrics_dir):
+        assert client.get('/api/v1/titles/').status_code == 200
+        assert client.get('/api/v1/titles/').status_code == 200
+
+        response = client.get(self.url)
+
+        assert response.status_code == 200
+        lines = metric_lines(response)
+        assert ('yamdb_requests_total{method="GET",route="titles-list",'
+                'status="200"} 2.0') in lines, (
+            'Проверьте, что запросы считаются по имени маршрута'
+        )
+        assert ('yamdb_request_duration_seconds_count'
+                '{route="titles-list"} 2') in lines
+        assert ('yamdb_request_db_queries_count'
+                '{route="titles-list"} 2') in lines
+        assert ('yamdb_cache_requests_total{cache="response",'
+                'result="hit"} 1.0') in lines, (
+            'Проверьте, что считаются попадания в кеш ответов'
+        )
+        assert any(
+            line.startswith('yamdb_worker_last_flush_timestamp_seconds')
+            for line in lines
+        )
+
+    def test_workers_are_added_up(self, client, metrics_dir):
+        (metrics_dir / '1.json').write_text(json.dumps({
+            'pid': 1,
+            'updated': 0,
+            'counters': [[
+                'yamdb_requests_total',
+                {'method': 'GET', 'route': 'titles-list', 'status': '200'},
+                3,
+            ]],
+            'histograms': [],
+            'pools': {
+                'default': {
+                    'max_size': 5, 'in_use': 1, 'idle': 2,
+                    'checkouts': 7, 'waits': 0, 'discarded': 0,
+                },
+            },
+        }))
+        client.get('/api/v1/titles/')
+
+        lines = metric_lines(client.get(self.url))
+
+        assert ('yamdb_requests_total{method="GET",route="titles-list",'
+                'status="200"} 4.0') in lines, (
+            'Проверьте, что метрики рабочих процессов суммируются'
+        )
+        assert ('yamdb_db_pool_connections{alias="default",pid="1",'
+                'state="idle"} 2') in lines
+
+    def test_stopped_worker_is_archived(self, client, metrics_dir):
+        from api_yamdb.metrics import archive
+
+        for pid in (1, 2):
+            (metrics_dir / f'{pid}.json').write_text(json.dumps({
+                'pid': pid,
+                'updated': 0,
+                'counters': [['yamdb_requests_total', {'status': '200'}, 3]],
+                'histograms': [],
+                'pools': {
+                    'default': {
+                        'max_size': 5, 'in_use': 1, 'idle': 2,
+                        'checkouts': 7, 'waits': 0, 'discarded': 0,
+                    },
+                },
+            }))
+            archive(pid)
+
+        lines = metric_lines(client.get(self.url))
+
+        assert 'yamdb_requests_total{status="200"} 6.0' in lines, (
+            'Проверьте, что счётчики остановленных воркеров сохраняются'
+        )
+        assert ('yamdb_db_pool_events_total{alias="default",'
+                'event="checkouts"} 14.0') in lines
+        assert not any('pid="1"' in line or 'pid="2"' in line
+                       for line in lines), (
+            'Проверьте, что метрики-состояния остановленных воркеров '
+            'удаляются'
+        )
+        assert sorted(path.name for path in metrics_dir.iterdir()) == [
+            f'{os.getpid()}.json', 'archive.json']
+
+    def test_disabled(self, client):
+        assert client.get(self.url).status_code == 404
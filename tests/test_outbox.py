@@ -0,0 +1,60 @@
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db
+class TestOutbox:
+
+    def test_signup_enqueues_email(self, client):
+        from users.models import OutgoingEmail
+
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'newbie', 'email': 'newbie@yamdb.fake'})
+
+        assert response.status_code == 200
+        assert not mail.outbox, (
+            'Проверьте, что регистрация не отправляет письмо синхронно'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'newbie@yamdb.fake'
+        assert 'confirmation_code' in email.message
+
+    def test_worker_sends_batch(self, client):
+        from users.models import OutgoingEmail
+
+        for index in range(3):
+            client.post('/api/v1/auth/signup/', data={
+                'username': f'user{index}', 'email': f'user{index}@yamdb.fake'})
+
+        call_command('send_outbox', '--once', stdout=StringIO())
+
+        assert len(mail.outbox) == 3
+        assert not OutgoingEmail.objects.filter(sent__isnull=True).exists()
+
+    def test_failed_email_is_retried_later(self, user, settings):
+        from users.models import OutgoingEmail
+
+        settings.EMAIL_BACKEND = 'tests.test_outbox.FailingBackend'
+        user.email_user('Тема', 'Текст')
+
+        call_command('send_outbox', '--once', stdout=StringIO(),
+                     stderr=StringIO())
+
+        email = OutgoingEmail.objects.get()
+        assert email.sent is None
+        assert email.attempts == 1
+        assert email.next_attempt > email.created, (
+            'Проверьте, что неотправленное письмо откладывается'
+        )
+        assert 'SMTP' in email.last_error
+        assert not OutgoingEmail.objects.pending(5).exists()
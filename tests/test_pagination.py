@@ -0,0 +1,135 @@
+import pytest
+
+from .test_titles import create_titles
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def create_reviews(self, django_user_model, count):
+        title, = create_titles(1)
+        for index in range(count):
+            author = django_user_model.objects.create_user(
+                username=f'author{index}', email=f'author{index}@yamdb.fake')
+            title.reviews.create(author=author, text=f'Отзыв {index}', score=5)
+        return title
+
+    def test_page_number_mode_is_default(self, client, django_user_model):
+        title = self.create_reviews(django_user_model, 7)
+
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == 7, (
+            'Проверьте, что без параметра `cursor` ответ не изменился'
+        )
+        assert len(data['results']) == 5
+
+    def test_cursor_mode_walks_reviews(self, client, django_user_model):
+        title = self.create_reviews(django_user_model, 7)
+
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/?cursor=')
+
+        assert response.status_code == 200
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в режиме курсора не выполняется подсчёт записей'
+        )
+        assert data['previous'] is None
+        assert 'cursor=' in data['next']
+        texts = [review['text'] for review in data['results']]
+
+        data = client.get(data['next']).json()
+        texts += [review['text'] for review in data['results']]
+        assert data['next'] is None
+        assert texts == [f'Отзыв {index}' for index in range(7)], (
+            'Проверьте, что курсор проходит все отзывы по дате публикации'
+        )
+
+    def test_cursor_mode_for_titles(self, client):
+        create_titles(7)
+
+        data = client.get('/api/v1/titles/?cursor=').json()
+        names = [title['name'] for title in data['results']]
+        data = client.get(data['next']).json()
+        names += [title['name'] for title in data['results']]
+
+        assert names == [f'Произведение {index:04}' for index in range(7)]
+
+
+@pytest.mark.django_db
+class TestPageSize:
+
+    def test_page_size_param(self, client):
+        create_titles(12)
+
+        data = client.get('/api/v1/titles/?page_size=10').json()
+
+        assert data['count'] == 12
+        assert len(data['results']) == 10, (
+            'Проверьте, что параметр `page_size` задаёт размер страницы'
+        )
+        assert 'page_size=10' in data['next']
+
+    def test_page_size_cap(self, client, monkeypatch):
+        from api.pagination import CommentPagination, TitlePagination
+
+        monkeypatch.setattr(TitlePagination, 'max_page_size', 3)
+        create_titles(5)
+
+        data = client.get('/api/v1/titles/?page_size=1000').json()
+
+        assert len(data['results']) == 3, (
+            'Проверьте, что размер страницы ограничен `max_page_size`'
+        )
+        assert CommentPagination.max_page_size == 200
+
+    def test_cursor_page_size(self, client):
+        create_titles(7)
+
+        data = client.get('/api/v1/titles/?cursor=&page_size=7').json()
+
+        assert len(data['results']) == 7
+        assert data['next'] is None
+
+
+@pytest.mark.django_db
+class TestUncountedPages:
+
+    def test_no_count_query(self, client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        create_titles(7)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/?count=false')
+
+        data = response.json()
+        assert 'count' not in data
+        assert len(data['results']) == 5
+        assert not any(
+            'COUNT(' in query['sql'].upper()
+            for query in context.captured_queries
+        ), 'Проверьте, что с `count=false` записи не подсчитываются'
+
+        data = client.get(data['next']).json()
+        assert len(data['results']) == 2
+        assert data['next'] is None
+        assert 'count=false' in data['previous']
+
+    def test_page_out_of_range(self, client):
+        create_titles(3)
+
+        response = client.get('/api/v1/titles/?count=false&page=2')
+
+        assert response.status_code == 404
+
+    def test_empty_list(self, client):
+        response = client.get('/api/v1/categories/?count=false')
+
+        assert response.status_code == 200
+        assert response.json() == {
+            'next': None, 'previous': None, 'results': []
+        }
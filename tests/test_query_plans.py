@@ -0,0 +1,27 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from .test_titles import create_titles
+
+
+@pytest.mark.django_db
+class TestQueryPlans:
+
+    def test_indexed_access_paths(self, user, admin):
+        title, = create_titles(1, reviews_per_title=2, authors=(user, admin))
+        title.reviews.first().comments.create(author=user, text='Текст')
+        output = StringIO()
+
+        call_command('check_query_plans', '--min-rows', '2', '-v', '2',
+                     stdout=output)
+
+        assert 'CommentViewSet.list' in output.getvalue()
+
+    def test_sequential_scan_fails(self):
+        create_titles(1)
+
+        with pytest.raises(CommandError, match='CategoriesViewSet.list'):
+            call_command('check_query_plans', '--min-rows', '1',
+                         stdout=StringIO())
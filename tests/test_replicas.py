@@ -0,0 +1,92 @@
+import pytest
+from django.db import connections
+
+
+@pytest.fixture
+def reads(settings, monkeypatch):
+    """Route reads to the stand-in replica and record the chosen aliases.
+
+    The replica shares the connection of the primary, so it sees the rows
+    of the test transaction.
+    """
+    from api_yamdb import db_routers
+
+    settings.REPLICA_DATABASES = ['replica']
+    settings.REPLICA_MAX_LAG = 0
+    monkeypatch.setattr(db_routers, '_health', {})
+    aliases = []
+    db_for_read = db_routers.ReplicaRouter.db_for_read
+
+    def record(self, model, **hints):
+        alias = db_for_read(self, model, **hints)
+        aliases.append(alias)
+        return alias
+
+    monkeypatch.setattr(db_routers.ReplicaRouter, 'db_for_read', record)
+    replica = connections['replica']
+    connections['replica'] = connections['default']
+    yield aliases
+    connections['replica'] = replica
+
+
+def auth_header(user):
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    return {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+
+
+@pytest.mark.django_db
+class TestReplicaRouting:
+    url = '/api/v1/titles/'
+
+    def test_safe_requests_read_from_replica(self, client, reads):
+        assert client.get(self.url).status_code == 200
+        assert reads and set(reads) == {'replica'}, (
+            'Проверьте, что GET-запросы читают данные из реплики'
+        )
+
+    def test_writer_reads_from_primary(self, client, admin, reads):
+        header = auth_header(admin)
+        data = {'name': 'Жанр', 'slug': 'genre'}
+        response = client.post('/api/v1/genres/', data=data, **header)
+        assert response.status_code == 201
+
+        reads.clear()
+        assert client.get(self.url, **header).status_code == 200
+        assert set(reads) == {'default'}, (
+            'Проверьте, что после записи клиент читает из основной базы'
+        )
+
+        reads.clear()
+        assert client.get('/api/v1/categories/').status_code == 200
+        assert set(reads) == {'replica'}, (
+            'Проверьте, что остальные клиенты продолжают читать из реплики'
+        )
+
+    def test_recent_change_is_read_from_primary(
+            self, client, reads, settings,
+            django_capture_on_commit_callbacks):
+        from reviews.models import Category
+
+        assert client.get(self.url).status_code == 200
+        settings.REPLICA_MAX_LAG = 60
+        with django_capture_on_commit_callbacks(execute=True):
+            Category.objects.create(name='Фильм', slug='movie')
+
+        reads.clear()
+        assert client.get(self.url).status_code == 200
+        assert set(reads) == {'default'}, (
+            'Проверьте, что сразу после изменения данные читаются из '
+            'основной базы'
+        )
+
+    def test_lagging_replica_is_skipped(self, client, reads, monkeypatch):
+        from api_yamdb import db_routers
+
+        monkeypatch.setattr(db_routers, 'replica_lag', lambda alias: 60)
+
+        assert client.get(self.url).status_code == 200
+        assert set(reads) == {'default'}, (
+            'Проверьте, что при отставании реплики чтение идёт из основной '
+            'базы'
+        )
@@ -0,0 +1,172 @@
+import threading
+
+import pytest
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+
+from .test_titles import create_titles
+
+DUPLICATE = {'non_field_errors': ['Вы оставляли отзыв на произведение']}
+
+
+@pytest.mark.django_db
+class TestReviewCreate:
+
+    def test_create_queries(self, user_client):
+        title, = create_titles(1)
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                f'/api/v1/titles/{title.id}/reviews/',
+                {'text': 'Отзыв', 'score': 7})
+
+        assert response.status_code == 201
+        statements = [
+            query['sql'].split()[0].upper()
+            for query in context.captured_queries
+        ]
+        assert 'SELECT' not in statements, (
+            'Проверьте, что перед созданием отзыва не выполняются '
+            'проверочные запросы'
+        )
+        title.refresh_from_db()
+        assert title.rating == 7.0
+
+    def test_duplicate(self, user_client):
+        from reviews.models import Review
+
+        title, = create_titles(1)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        user_client.post(url, {'text': 'Отзыв', 'score': 7})
+
+        response = user_client.post(url, {'text': 'Отзыв', 'score': 3})
+
+        assert response.status_code == 400
+        assert response.json() == DUPLICATE
+        title.refresh_from_db()
+        assert (Review.objects.count(), title.rating) == (1, 7.0), (
+            'Проверьте, что повторный отзыв не меняет рейтинг'
+        )
+
+    def test_missing_title(self, user_client):
+        from reviews.models import Review
+
+        response = user_client.post(
+            '/api/v1/titles/1/reviews/', {'text': 'Отзыв', 'score': 7})
+
+        assert response.status_code == 404
+        assert not Review.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentReviews:
+
+    def test_parallel_posts(self, user, user_client):
+        from reviews.models import Review
+
+        title, = create_titles(1)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        barrier = threading.Barrier(8)
+        responses = []
+
+        def post(score):
+            barrier.wait()
+            try:
+                responses.append(
+                    user_client.post(url, {'text': 'Отзыв', 'score': score}))
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=post, args=(score,))
+            for score in range(1, 9)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(
+            response.status_code for response in responses
+        ) == [201] + [400] * 7, (
+            'Проверьте, что из одновременных отзывов одного автора '
+            'создаётся один, а остальные получают ошибку 400'
+        )
+        assert all(
+            response.json() == DUPLICATE
+            for response in responses if response.status_code == 400
+        )
+        review = Review.objects.get()
+        title.refresh_from_db()
+        assert (title.rating_count, title.rating) == (1, review.score)
+
+
+@pytest.mark.django_db
+class TestNestedRoutes:
+
+    def test_reviews_list(self, client, django_user_model):
+        from reviews.models import Review
+
+        title, empty = create_titles(2)
+        for index in range(5):
+            author = django_user_model.objects.create_user(
+                username=f'author{index}', email=f'author{index}@yamdb.fake')
+            Review.objects.create(title=title, author=author, text='Отзыв')
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 5
+        assert len(context.captured_queries) == 2, (
+            'Проверьте, что список отзывов загружается без запроса '
+            'произведения и без отдельных запросов авторов'
+        )
+        response = client.get(f'/api/v1/titles/{empty.id}/reviews/')
+        assert response.status_code == 200
+        assert response.json()['results'] == []
+        response = client.get('/api/v1/titles/999/reviews/')
+        assert response.status_code == 404, (
+            'Проверьте, что для несуществующего произведения '
+            'возвращается 404, а не пустой список'
+        )
+
+    def test_comments_belong_to_title(self, user, user_client):
+        from reviews.models import Comment, Review
+
+        title, other = create_titles(2)
+        review = Review.objects.create(title=title, author=user, text='Отзыв')
+        comment = Comment.objects.create(
+            review=review, author=user, text='Комментарий')
+        url = f'/api/v1/titles/{other.id}/reviews/{review.id}/comments/'
+
+        for response in (
+            user_client.get(url),
+            user_client.get(f'{url}{comment.id}/'),
+            user_client.post(url, {'text': 'Комментарий'}),
+        ):
+            assert response.status_code == 404, (
+                'Проверьте, что комментарии доступны только по адресу '
+                'произведения, к которому относится отзыв'
+            )
+        assert Comment.objects.count() == 1
+
+    def test_comment_create_queries(self, user, user_client):
+        from reviews.models import Review
+
+        title, = create_titles(1)
+        review = Review.objects.create(title=title, author=user, text='Отзыв')
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+                {'text': 'Комментарий'})
+
+        assert response.status_code == 201
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].upper().startswith('SELECT')
+        ]
+        assert len(selects) == 1, (
+            'Проверьте, что отзыв проверяется одним запросом'
+        )
@@ -0,0 +1,86 @@
+import json
+import logging
+
+import pytest
+
+from .test_titles import create_titles
+
+
+def timing_entries(header):
+    return {part.split(';')[0] for part in header.split(', ')}
+
+
+@pytest.mark.django_db
+class TestRequestTiming:
+    url = '/api/v1/titles/'
+
+    def test_server_timing_header(self, client):
+        create_titles(2)
+
+        response = client.get(self.url)
+
+        assert response.status_code == 200
+        assert timing_entries(response['Server-Timing']) == {
+            'db', 'serialize', 'render', 'total'
+        }, (
+            'Проверьте, что заголовок Server-Timing содержит время запросов '
+            'к базе, сериализации, отрисовки и общее время'
+        )
+
+    def test_timing_is_logged(self, client, caplog):
+        create_titles(1)
+
+        with caplog.at_level(logging.INFO, logger='api_yamdb.timing'):
+            client.get(self.url)
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['view'] == 'TitlesViewSet.list', (
+            'Проверьте, что в журнал пишется имя вьюсета и действия'
+        )
+        assert record['status'] == 200
+        assert record['queries'] > 0
+
+    def test_disabled(self, client, settings):
+        settings.REQUEST_TIMING_ENABLED = False
+
+        assert 'Server-Timing' not in client.get(self.url)
+
+    def test_not_sampled(self, client, settings):
+        settings.REQUEST_TIMING_SAMPLE_RATE = 0
+
+        assert 'Server-Timing' not in client.get(self.url)
+
+
+class TestTimingDefaults:
+
+    def test_header_is_off(self):
+        from api_yamdb import settings
+
+        assert not settings.REQUEST_TIMING_HEADER, (
+            'Проверьте, что по умолчанию заголовок Server-Timing выключен'
+        )
+        assert settings.REQUEST_TIMING_SAMPLE_RATE < 1, (
+            'Проверьте, что по умолчанию замеряется лишь часть запросов'
+        )
+
+
+class TestRepeatedQueries:
+
+    def test_repeated_sql_is_reported(self, settings):
+        from api_yamdb.middleware import RequestTimings
+
+        settings.REQUEST_TIMING_REPEATED_QUERIES = 3
+        timings = RequestTimings()
+
+        def execute(sql, params, many, context):
+            return None
+
+        for author_id in range(3):
+            timings(execute, 'SELECT * FROM users_user WHERE id = %s',
+                    (author_id,), False, {})
+        timings(execute, 'SELECT * FROM reviews_review', (), False, {})
+
+        assert timings.queries == 4
+        assert timings.repeated_queries() == [
+            {'sql': 'SELECT * FROM users_user WHERE id = %s', 'count': 3}
+        ], 'Проверьте, что повторяющиеся запросы помечаются как N+1'
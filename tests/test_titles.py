@@ -0,0 +1,216 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def create_titles(count, reviews_per_title=0, authors=()):
+    from reviews.models import Category, Genre, Review, Title
+
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    titles = []
+    for index in range(count):
+        title = Title.objects.create(
+            name=f'Произведение {index:04}', year=2000, category=category
+        )
+        title.genre.add(genre)
+        for score, author in enumerate(authors[:reviews_per_title], start=1):
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=score
+            )
+        titles.append(title)
+    return titles
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def test_titles_list_rating(self, user, admin, client):
+        create_titles(3, reviews_per_title=2, authors=(user, admin))
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/')
+
+        assert response.status_code == 200
+        assert [title['rating'] for title in response.json()['results']] == [
+            1.5, 1.5, 1.5
+        ], 'Проверьте, что `rating` содержит среднюю оценку произведения'
+        aggregates = [
+            query for query in context.captured_queries
+            if 'AVG' in query['sql'].upper()
+            and 'COUNT(' not in query['sql'].upper()
+        ]
+        assert not aggregates, (
+            'Проверьте, что рейтинг произведений берётся из сохранённого '
+            'значения, а не вычисляется запросом к отзывам'
+        )
+
+    def test_title_detail_rating(self, user, client):
+        rated, unrated = create_titles(2)
+        rated.reviews.create(author=user, text='Отзыв', score=7)
+
+        response = client.get(f'/api/v1/titles/{rated.id}/')
+        assert response.status_code == 200
+        assert response.json()['rating'] == 7.0
+
+        response = client.get(f'/api/v1/titles/{unrated.id}/')
+        assert response.status_code == 200
+        assert response.json()['rating'] is None, (
+            'Проверьте, что у произведения без отзывов `rating` равен None'
+        )
+
+
+@pytest.mark.django_db
+class TestTitlesQueries:
+
+    @pytest.mark.parametrize('page_size', (5, 50, 500))
+    def test_titles_list_query_count(self, client, monkeypatch, page_size):
+        from rest_framework.pagination import PageNumberPagination
+
+        monkeypatch.setattr(PageNumberPagination, 'page_size', page_size)
+        create_titles(page_size)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/')
+
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert len(results) == page_size
+        assert all(
+            title['genre'] and title['category'] for title in results
+        )
+        assert len(context.captured_queries) == 3, (
+            'Проверьте, что страница произведений вместе с жанрами и '
+            'категориями загружается фиксированным числом запросов'
+        )
+
+
+@pytest.mark.django_db
+class TestStoredRating:
+
+    def test_rating_follows_reviews(self, user, admin):
+        from reviews.models import Review
+
+        title, = create_titles(1)
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=4)
+        Review.objects.create(title=title, author=admin, text='Отзыв', score=8)
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            12, 2, 6.0
+        ), 'Проверьте, что рейтинг обновляется при создании отзыва'
+
+        review.score = 10
+        review.save()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            18, 2, 9.0
+        ), 'Проверьте, что рейтинг обновляется при изменении оценки'
+
+        review.delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            8, 1, 8.0
+        ), 'Проверьте, что рейтинг обновляется при удалении отзыва'
+
+        admin.delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            0, 0, None
+        ), 'Проверьте, что рейтинг обновляется при каскадном удалении'
+
+    def test_stale_review(self, user):
+        from reviews.models import Review
+
+        title, = create_titles(1)
+        Review.objects.create(title=title, author=user, text='Отзыв', score=5)
+        first, second = Review.objects.get(), Review.objects.get()
+
+        first.score = 7
+        first.save()
+        second.score = 9
+        second.save()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            9, 1, 9.0
+        ), 'Проверьте, что рейтинг считается от сохранённой в базе оценки'
+
+        first.delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            0, 0, None
+        ), 'Проверьте, что при удалении вычитается сохранённая оценка'
+
+    def test_stale_title(self, user, admin_client):
+        from reviews.models import Review, Title
+
+        title, = create_titles(1)
+        stale = Title.objects.get()
+        Review.objects.create(title=title, author=user, text='Отзыв', score=6)
+
+        stale.name = 'Новое название'
+        stale.save()
+        response = admin_client.patch(
+            f'/api/v1/titles/{title.id}/', {'description': 'Описание'})
+
+        assert response.status_code == 200
+        title.refresh_from_db()
+        assert (title.name, title.rating_sum, title.rating_count,
+                title.rating) == ('Новое название', 6, 1, 6.0), (
+            'Проверьте, что сохранение произведения не перезаписывает '
+            'рейтинг'
+        )
+
+    def test_patch_skips_search_vector(self, admin_client):
+        title, = create_titles(1)
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(
+                f'/api/v1/titles/{title.id}/', {'name': 'Новое название'})
+
+        assert response.status_code == 200
+        assert not any(
+            query['sql'].startswith('SELECT')
+            and 'search_vector' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что отложенный поисковый вектор не загружается'
+
+    def test_rebuild_ratings_command(self, user, admin):
+        from reviews.models import Title
+
+        title, = create_titles(1, reviews_per_title=2, authors=(user, admin))
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+
+        call_command('rebuild_ratings', stdout=StringIO())
+
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            3, 2, 1.5
+        ), 'Проверьте, что команда rebuild_ratings пересчитывает рейтинги'
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    def test_search_is_ranked_and_combinable(self, client):
+        from reviews.models import Title
+
+        first, second, other = create_titles(3)
+        Title.objects.filter(pk=first.pk).update(
+            name='летопись', description='дракон и рыцарь')
+        Title.objects.filter(pk=second.pk).update(
+            name='дракон', description='рыцарь')
+        Title.objects.filter(pk=other.pk).update(year=1999)
+
+        response = client.get('/api/v1/titles/?search=дракон рыцарь')
+        assert [title['id'] for title in response.json()['results']] == [
+            second.id, first.id
+        ], 'Проверьте, что результаты поиска упорядочены по релевантности'
+
+        response = client.get('/api/v1/titles/?search=дракон&year=1999')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что поиск сочетается с остальными фильтрами'
+        )
@@ -0,0 +1,129 @@
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def user_queries(context):
+    return [
+        query for query in context.captured_queries
+        if 'FROM "users_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db
+class TestGetToken:
+    url = '/api/v1/auth/token/'
+
+    def test_user_is_fetched_once(self, client, user):
+        data = {
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.url, data=data)
+
+        assert response.status_code == 200
+        assert 'token' in response.json()
+        assert len(user_queries(context)) == 1, (
+            'Проверьте, что при выдаче токена пользователь запрашивается '
+            'из базы один раз'
+        )
+
+    def test_unknown_user(self, client):
+        data = {'username': 'nobody', 'confirmation_code': 'code'}
+        assert client.post(self.url, data=data).status_code == 404
+
+    def test_wrong_code(self, client, user):
+        data = {'username': user.username, 'confirmation_code': 'wrong'}
+        response = client.post(self.url, data=data)
+
+        assert response.status_code == 400
+        assert 'confirmation_code' in response.json()
+
+    def test_failed_attempts_are_limited(self, client, user, settings):
+        settings.TOKEN_MAX_FAILED_ATTEMPTS = 3
+        data = {'username': user.username, 'confirmation_code': 'wrong'}
+        for _ in range(3):
+            assert client.post(self.url, data=data).status_code == 400
+
+        data['confirmation_code'] = default_token_generator.make_token(user)
+        assert client.post(self.url, data=data).status_code == 429, (
+            'Проверьте, что после исчерпания попыток подбор кода '
+            'блокируется'
+        )
+
+    def test_success_resets_failures(self, client, user, settings):
+        settings.TOKEN_MAX_FAILED_ATTEMPTS = 2
+        wrong = {'username': user.username, 'confirmation_code': 'wrong'}
+        right = {
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        }
+        assert client.post(self.url, data=wrong).status_code == 400
+        assert client.post(self.url, data=right).status_code == 200
+        assert client.post(self.url, data=wrong).status_code == 400
+        assert client.post(self.url, data=right).status_code == 200
+
+    def test_other_client_is_not_blocked(self, client, user, settings):
+        settings.TOKEN_MAX_FAILED_ATTEMPTS = 2
+        data = {'username': user.username, 'confirmation_code': 'wrong'}
+        for _ in range(2):
+            client.post(self.url, data=data, REMOTE_ADDR='10.0.0.1')
+
+        data['confirmation_code'] = default_token_generator.make_token(user)
+        assert client.post(
+            self.url, data=data, REMOTE_ADDR='10.0.0.2'
+        ).status_code == 200, (
+            'Проверьте, что ошибки одного клиента не блокируют '
+            'пользователя для других'
+        )
+        assert client.post(
+            self.url, data=data, REMOTE_ADDR='10.0.0.1'
+        ).status_code == 429
+
+    def test_client_attempts_are_limited(self, client, user, admin,
+                                         settings):
+        settings.TOKEN_MAX_CLIENT_FAILED_ATTEMPTS = 2
+        for username in (user.username, admin.username):
+            client.post(self.url, data={
+                'username': username, 'confirmation_code': 'wrong'})
+
+        response = client.post(self.url, data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+
+        assert response.status_code == 429, (
+            'Проверьте, что число ошибок с одного адреса ограничено для '
+            'всех пользователей вместе'
+        )
+
+    def test_unknown_users_are_limited(self, client, settings):
+        settings.TOKEN_MAX_CLIENT_FAILED_ATTEMPTS = 2
+
+        statuses = [
+            client.post(self.url, data={
+                'username': f'nobody{index}', 'confirmation_code': 'code'
+            }).status_code
+            for index in range(4)
+        ]
+
+        assert statuses == [404, 404, 429, 429], (
+            'Проверьте, что запросы с несуществующими именами учитываются '
+            'в лимите ошибок клиента'
+        )
+
+    def test_forwarded_client(self, client, user, settings):
+        settings.TOKEN_MAX_FAILED_ATTEMPTS = 1
+        data = {'username': user.username, 'confirmation_code': 'wrong'}
+        client.post(self.url, data=data, HTTP_X_FORWARDED_FOR='10.0.0.1')
+
+        data['confirmation_code'] = default_token_generator.make_token(user)
+        assert client.post(
+            self.url, data=data, HTTP_X_FORWARDED_FOR='10.0.0.2'
+        ).status_code == 200, (
+            'Проверьте, что за прокси клиент определяется по '
+            'X-Forwarded-For'
+        )